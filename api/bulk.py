@@ -0,0 +1,37 @@
+from typing import Iterable
+from sqlalchemy import Integer, any_, bindparam, literal
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from api.models.data_models import Startup, WorkstreamStartupEvaluation
+
+
+def any_id(column, ids: Iterable[int]):
+    """`column = ANY(:ids)`: one array parameter however many ids there are."""
+    return column == any_(bindparam("ids", list(ids), type_=ARRAY(Integer)))
+
+
+async def link_startups(
+    session: AsyncSession, workstream_id: int, startup_ids: Iterable[int]
+) -> set[int]:
+    """
+    Create the (empty) evaluations linking `startup_ids` to the workstream in
+    one statement, skipping existing links. Returns the ids with no startup;
+    the caller decides whether to roll back.
+    """
+    startup_ids = set(startup_ids)
+    if not startup_ids:
+        return set()
+    found = select(Startup.id).where(any_id(Startup.id, startup_ids)).cte("found")
+    linked = (
+        insert(WorkstreamStartupEvaluation)
+        .from_select(
+            ["workstream_id", "startup_id"],
+            select(literal(workstream_id), found.c.id),
+        )
+        .on_conflict_do_nothing()
+        .cte("linked")
+    )
+    rows = await session.exec(select(found.c.id).add_cte(linked))
+    return startup_ids - set(rows.all())
@@ -0,0 +1,144 @@
+import json
+import os
+from functools import lru_cache
+from typing import Optional
+from pydantic import BaseModel
+
+from api.models.read_models import EvaluationReadWithStartup, WorkstreamRead
+
+# Token budget for the workstream part of evaluation / conclusion prompts
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "8000"))
+TOKEN_ENCODING = "o200k_base"  # gpt-4o / gpt-5 family
+
+WORKSTREAM_FIELDS = (
+    "title",
+    "use_case",
+    "challenge",
+    "technologies",
+    "overall_recommendation",
+)
+STARTUP_FIELDS = (
+    "company_name",
+    "country",
+    "year_founded",
+    "funding_stage",
+    "trl",
+    "tech_offering",
+    "uvp",
+    "use_cases",
+)
+EVALUATION_FIELDS = ("competitive_advantage", "risks", "collaboration_potential")
+SUMMARY_WORDS = 40  # per text field of a summarized startup
+
+
+@lru_cache(maxsize=1)
+def get_encoding():
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding(TOKEN_ENCODING)
+    except Exception as e:  # e.g. the BPE file cannot be downloaded
+        print(f"Token counts are estimated, {TOKEN_ENCODING} unavailable: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    encoding = get_encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4  # ~4 characters per token in English
+    return len(encoding.encode(text))
+
+
+class WorkstreamContext(BaseModel):
+    text: str
+    tokens: int
+    startups_full: int = 0
+    startups_summarized: int = 0
+    startups_named: int = 0
+    startups_omitted: int = 0
+
+
+def compact(data: dict) -> str:
+    """One-line JSON without empty fields."""
+    data = {k: v for k, v in data.items() if v not in (None, "", [], {})}
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def shorten(value, words: int = SUMMARY_WORDS):
+    if isinstance(value, str):
+        parts = value.split()
+        return value if len(parts) <= words else " ".join(parts[:words]) + "…"
+    if isinstance(value, list):
+        return value[:3]
+    return value
+
+
+def startup_entries(evaluation: EvaluationReadWithStartup) -> list[str]:
+    """Renderings of one evaluated startup: full, summarized, name only."""
+    startup = evaluation.startup.model_dump(mode="json", include=set(STARTUP_FIELDS))
+    review = evaluation.model_dump(mode="json", include=set(EVALUATION_FIELDS))
+    full = {**startup, **review}
+    summary = {k: shorten(v) for k, v in full.items()}
+    return [
+        compact(full),
+        compact(summary),
+        compact({"company_name": startup.get("company_name")}),
+    ]
+
+
+def build_workstream_context(
+    workstream: WorkstreamRead,
+    focus_company: Optional[str] = None,
+    budget: int = PROMPT_TOKEN_BUDGET,
+) -> WorkstreamContext:
+    """
+    Compact prompt context for `workstream`: its own fields plus the fields of
+    each evaluated startup that matter for judging it (no citations,
+    founders, investors, competitor maps or other workstreams).
+
+    Startups are ranked (`focus_company` first). While the context exceeds
+    `budget` tokens, the lowest-ranked ones are summarized, then reduced to
+    their name, then omitted; any budget left over restores detail from the
+    top of the ranking. The focus company always keeps its full text.
+    """
+    header = compact(workstream.model_dump(mode="json", include=set(WORKSTREAM_FIELDS)))
+    evaluations = sorted(
+        workstream.evaluations,
+        key=lambda e: e.startup.company_name != focus_company,
+    )
+    entries = [startup_entries(evaluation) for evaluation in evaluations]
+    # The focus company, ranked first, is never shrunk
+    first = 0
+    if focus_company and evaluations:
+        first = int(evaluations[0].startup.company_name == focus_company)
+    costs = [[count_tokens(e) + 1 for e in options] + [0] for options in entries]
+    levels = [0] * len(entries)  # full, summarized, named, omitted
+    used = count_tokens(f"{header}\nStartups:") + sum(c[0] for c in costs)
+    for level in (1, 2, 3):
+        for i in reversed(range(first, len(entries))):
+            if used <= budget:
+                break
+            used += costs[i][level] - costs[i][levels[i]]
+            levels[i] = level
+    # Spend what is left on the highest-ranked startups again
+    for i, cost in enumerate(costs):
+        for level in range(levels[i]):
+            if used + cost[level] - cost[levels[i]] <= budget:
+                used += cost[level] - cost[levels[i]]
+                levels[i] = level
+                break
+
+    lines = [header, "Startups:"]
+    lines += [options[lvl] for options, lvl in zip(entries, levels) if lvl < 3]
+    omitted = levels.count(3)
+    if omitted:
+        lines.append(f"(+{omitted} more startups omitted)")
+    text = "\n".join(lines)
+    return WorkstreamContext(
+        text=text,
+        tokens=count_tokens(text),
+        startups_full=levels.count(0),
+        startups_summarized=levels.count(1),
+        startups_named=levels.count(2),
+        startups_omitted=omitted,
+    )
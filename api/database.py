@@ -1,6 +1,14 @@
 import os
+import random
+import time
 from dotenv import load_dotenv
-from sqlmodel import SQLModel, create_engine, Session
+from pgvector.asyncpg import register_vector
+from pydantic import BaseModel
+from sqlalchemy import event, exc, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 # Load root .env
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), "..", ".env"))
@@ -11,12 +19,131 @@ PG_DB   = os.getenv("POSTGRES_DB")
 PG_HOST = os.getenv("POSTGRES_HOST", "localhost")
 PG_PORT = os.getenv("POSTGRES_PORT", "5432")
 
-DATABASE_URL = f"postgresql+psycopg2://{PG_USER}:{PG_PASS}@{PG_HOST}:{PG_PORT}/{PG_DB}"
-engine = create_engine(DATABASE_URL, echo=True)
+DATABASE_URL = f"postgresql+asyncpg://{PG_USER}:{PG_PASS}@{PG_HOST}:{PG_PORT}/{PG_DB}"
+# Blocking URL for command line scripts (db init, benchmarks)
+SYNC_DATABASE_URL = (
+    f"postgresql+psycopg2://{PG_USER}:{PG_PASS}@{PG_HOST}:{PG_PORT}/{PG_DB}"
+)
 
-def init_db():
-    SQLModel.metadata.create_all(engine)
+# Runtime profile, per API process: size the pool so that
+# uvicorn workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) stays under max_connections
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # wait for a connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds, -1 to keep
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))  # 0: off
+# Fraction of SQL statements printed with their duration (1 logs everything)
+DB_LOG_SQL_SAMPLE_RATE = float(os.getenv("DB_LOG_SQL_SAMPLE_RATE", "0"))
 
-def get_session():
-    with Session(engine) as session:
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a connection."""
+
+    checkouts = 0
+    timeouts = 0
+    wait_seconds_total = 0.0
+    wait_seconds_max = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
+engine = create_async_engine(
+    DATABASE_URL,
+    poolclass=TimedQueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+    connect_args={
+        "server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}
+    },
+)
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def register_vector_codec(dbapi_connection, connection_record):
+    # asyncpg needs a codec for pgvector's `vector` type
+    dbapi_connection.run_async(register_vector)
+
+
+if DB_LOG_SQL_SAMPLE_RATE > 0:
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def sample_statement(conn, cursor, statement, parameters, context, executemany):
+        if random.random() < DB_LOG_SQL_SAMPLE_RATE:
+            context._sql_log_start = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def log_statement(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_sql_log_start", None)
+        if start is not None:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            print(f"SQL {elapsed_ms:.1f} ms: {' '.join(statement.split())}")
+
+
+class PoolStats(BaseModel):
+    size: int
+    max_overflow: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_ms_avg: float
+    wait_ms_max: float
+
+
+def pool_stats() -> PoolStats:
+    """Connection pool state of this process (see GET /db/pool)."""
+    pool = engine.pool
+    checkouts = pool.checkouts
+    return PoolStats(
+        size=pool.size(),
+        max_overflow=DB_MAX_OVERFLOW,
+        checked_out=pool.checkedout(),
+        checked_in=pool.checkedin(),
+        overflow=max(pool.overflow(), 0),
+        checkouts=checkouts,
+        timeouts=pool.timeouts,
+        wait_ms_avg=pool.wait_seconds_total * 1000 / checkouts if checkouts else 0,
+        wait_ms_max=pool.wait_seconds_max * 1000,
+    )
+
+
+# Objects stay loaded after commit: async sessions cannot lazy-load expired
+# attributes, and responses are serialized after the route returns.
+async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+# Enum types are declared with create_type=False and made by db/init.sql, so
+# databases created before lookup jobs need this one for create_all
+CREATE_JOB_STATUS_TYPE = """
+DO $$ BEGIN
+    CREATE TYPE job_status AS ENUM ('queued', 'running', 'succeeded', 'failed');
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$
+"""
+
+
+async def init_db():
+    async with engine.begin() as conn:
+        await conn.execute(text(CREATE_JOB_STATUS_TYPE))
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+
+async def get_session():
+    async with async_session() as session:
         yield session
@@ -0,0 +1,116 @@
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Any, Optional
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select
+
+from api.database import async_session
+from api.llm import EMBEDDING_MODEL, create_embeddings
+from api.models.data_models import EmbeddingCache
+
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "10000"))
+# OpenAI accepts at most 2048 inputs per embeddings request
+EMBEDDING_BATCH_SIZE = 2048
+
+
+class LRUCache:
+    """Minimal in-process LRU map; single event loop, so no locking."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, Any] = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: Any):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+memory_cache = LRUCache(EMBEDDING_CACHE_SIZE)
+
+
+def content_hash(text: str, model: str = EMBEDDING_MODEL) -> str:
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+async def embed_texts(texts: list[str]) -> list[list[float]]:
+    """
+    Embeddings for `texts`, in order.
+    Looks up the in-process LRU, then the `embedding_cache` table, and sends
+    only the remaining unique texts to OpenAI in one batched request.
+    """
+    if not texts:
+        return []
+    hashes = [content_hash(t) for t in texts]
+    found: dict[str, list[float]] = {}
+    for h in hashes:
+        cached = memory_cache.get(h)
+        if cached is not None:
+            found[h] = cached
+
+    pending = {h: t for h, t in zip(hashes, texts) if h not in found}
+    if pending:
+        # Sessions only around the queries: none is held while OpenAI answers
+        async with async_session() as session:
+            rows = await session.exec(
+                select(EmbeddingCache.content_hash, EmbeddingCache.embedding).where(
+                    EmbeddingCache.content_hash.in_(list(pending))
+                )
+            )
+            for h, embedding in rows:
+                found[h] = list(map(float, embedding))
+                memory_cache.put(h, found[h])
+                pending.pop(h)
+
+        items = list(pending.items())
+        for start in range(0, len(items), EMBEDDING_BATCH_SIZE):
+            batch = items[start : start + EMBEDDING_BATCH_SIZE]
+            embeddings = await create_embeddings([t for _, t in batch])
+            new_rows = []
+            for (h, _), embedding in zip(batch, embeddings):
+                found[h] = embedding
+                memory_cache.put(h, embedding)
+                new_rows.append(
+                    {
+                        "content_hash": h,
+                        "model": EMBEDDING_MODEL,
+                        "embedding": embedding,
+                    }
+                )
+            async with async_session() as session:
+                await session.exec(
+                    insert(EmbeddingCache).values(new_rows).on_conflict_do_nothing()
+                )
+                await session.commit()
+
+    return [found[h] for h in hashes]
+
+
+async def embed_text(text: str) -> list[float]:
+    return (await embed_texts([text]))[0]
+
+
+# Text fields of a startup and the columns holding their embeddings
+EMBEDDED_FIELDS = {"tech_offering": "tech_embedding", "uvp": "uvp_embedding"}
+
+
+async def embed_startup_fields(fields: dict) -> dict[str, list[float]]:
+    """
+    Embedding columns for the non-empty text fields in `fields`, e.g.
+    `{"tech_embedding": [...], "uvp_embedding": [...]}`, in one batch.
+    """
+    todo = [
+        (column, fields[field])
+        for field, column in EMBEDDED_FIELDS.items()
+        if fields.get(field)
+    ]
+    vectors = await embed_texts([text for _, text in todo])
+    return {column: vector for (column, _), vector in zip(todo, vectors)}
@@ -0,0 +1,36 @@
+from fastapi import HTTPException
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from api.models.data_models import (
+    Startup,
+    Workstream,
+    WorkstreamStartupEvaluation,
+    WorkstreamStartupEvaluationUpdate,
+)
+
+
+async def save_evaluation(
+    session: AsyncSession,
+    workstream_id: int,
+    startup_id: int,
+    evaluation: WorkstreamStartupEvaluationUpdate,
+):
+    """Create or update one evaluation with the fields set in `evaluation`."""
+    db_eval = await session.get(
+        WorkstreamStartupEvaluation, (workstream_id, startup_id)
+    )
+    if not db_eval:
+        db_startup = await session.get(Startup, startup_id)
+        if not db_startup:
+            raise HTTPException(status_code=404, detail="Start-up not found")
+        db_workstream = await session.get(Workstream, workstream_id)
+        if not db_workstream:
+            raise HTTPException(status_code=404, detail="Workstream not found")
+        db_eval = WorkstreamStartupEvaluation(
+            workstream=db_workstream, startup=db_startup
+        )
+
+    update_data = evaluation.model_dump(exclude_unset=True)
+    db_eval.sqlmodel_update(update_data)
+    session.add(db_eval)
+    await session.commit()
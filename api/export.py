@@ -0,0 +1,99 @@
+import csv
+import io
+import json
+import zlib
+from enum import Enum
+from typing import AsyncIterator
+from fastapi.responses import StreamingResponse
+from sqlmodel import SQLModel
+
+from api.database import async_session
+
+# Rows fetched per server-side cursor round trip (and per eager-load batch)
+EXPORT_BATCH_SIZE = 500
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+
+async def stream_models(statement, read_model: type[SQLModel]) -> AsyncIterator[list]:
+    """
+    Batches of `read_model` dicts for `statement`, read through a server-side
+    cursor so only one batch of ORM objects is alive at a time (the session's
+    identity map holds them weakly).
+    The generator owns its session: it outlives the request's dependencies.
+    """
+    async with async_session() as session:
+        result = await session.stream(
+            statement.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        async for partition in result.scalars().partitions():
+            yield [
+                read_model.model_validate(row).model_dump(mode="json")
+                for row in partition
+            ]
+
+
+def csv_value(value):
+    # Nested models and lists are kept as JSON in a single cell
+    return json.dumps(value) if isinstance(value, (dict, list)) else value
+
+
+async def encode_rows(
+    batches: AsyncIterator[list], fmt: ExportFormat, columns: list[str]
+) -> AsyncIterator[bytes]:
+    if fmt == ExportFormat.csv:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        async for rows in batches:
+            writer.writerows([[csv_value(r.get(c)) for c in columns] for r in rows])
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue().encode("utf-8")  # Header of an empty export
+    else:
+        async for rows in batches:
+            yield "".join(json.dumps(r) + "\n" for r in rows).encode("utf-8")
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        if compressed := compressor.compress(chunk):
+            yield compressed
+    yield compressor.flush()
+
+
+def export_response(
+    statement,
+    read_model: type[SQLModel],
+    name: str,
+    fmt: ExportFormat = ExportFormat.ndjson,
+    gzip: bool = False,
+) -> StreamingResponse:
+    """
+    Stream every row of `statement` as NDJSON or CSV (one column per field of
+    `read_model`), optionally gzipped, as a `<name>.<fmt>[.gz]` download.
+    """
+    chunks = encode_rows(
+        stream_models(statement, read_model), fmt, list(read_model.model_fields)
+    )
+    filename = f"{name}.{fmt.value}"
+    media_type = MEDIA_TYPES[fmt]
+    if gzip:
+        chunks = gzip_chunks(chunks)
+        filename, media_type = f"{filename}.gz", "application/gzip"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,157 @@
+import asyncio
+import os
+from datetime import timedelta
+from functools import partial
+from typing import Awaitable, Callable, Optional
+from sqlalchemy import and_, func, or_, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from api.database import async_session
+from api.models.data_models import JobStatusEnum, LookupJob, Startup
+
+# Concurrent lookups per API process
+LOOKUP_WORKERS = int(os.getenv("LOOKUP_WORKERS", "2"))
+# A running job whose worker stops renewing this lease is picked up again
+LOOKUP_JOB_LEASE_SECONDS = int(os.getenv("LOOKUP_JOB_LEASE_SECONDS", "600"))
+LOOKUP_MAX_ATTEMPTS = int(os.getenv("LOOKUP_MAX_ATTEMPTS", "3"))
+# Idle workers re-check the table this often (jobs from other processes)
+LOOKUP_POLL_SECONDS = float(os.getenv("LOOKUP_POLL_SECONDS", "1"))
+
+FINISHED_STATUSES = (JobStatusEnum.succeeded, JobStatusEnum.failed)
+
+# handler(session, startup_url, report) -> saved Startup; `report(progress)`
+# records a progress message and renews the job's lease
+Report = Callable[[str], Awaitable[None]]
+LookupHandler = Callable[[AsyncSession, str, Report], Awaitable[Startup]]
+
+
+def lease_expiry():
+    return func.now() + timedelta(seconds=LOOKUP_JOB_LEASE_SECONDS)
+
+
+class LookupJobQueue:
+    """
+    Postgres-backed queue of `LookupJob` rows worked by `LOOKUP_WORKERS`
+    asyncio tasks per process. Jobs enqueued here wake a worker at once;
+    jobs left behind by a stopped process are retried once their lease ends.
+    """
+
+    def __init__(self, handler: LookupHandler, workers: int = LOOKUP_WORKERS):
+        self.handler = handler
+        self.workers = workers
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self):
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self):
+        # Interrupted jobs keep their lease and are re-run after it expires
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def enqueue(self, session: AsyncSession, startup_url: str) -> LookupJob:
+        job = LookupJob(startup_url=startup_url, progress="Queued")
+        session.add(job)
+        await session.commit()
+        await session.refresh(job)
+        self._wakeup.set()
+        return job
+
+    async def claim(self) -> Optional[tuple[int, str, int]]:
+        """Lock the oldest runnable job: (id, startup_url, attempts)."""
+        runnable = (
+            select(LookupJob.id)
+            .where(
+                or_(
+                    LookupJob.status == JobStatusEnum.queued,
+                    and_(
+                        LookupJob.status == JobStatusEnum.running,
+                        LookupJob.locked_until < func.now(),
+                    ),
+                )
+            )
+            .order_by(LookupJob.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        async with async_session() as session:
+            claimed = (
+                await session.exec(
+                    update(LookupJob)
+                    .where(LookupJob.id == runnable)
+                    .values(
+                        status=JobStatusEnum.running,
+                        attempts=LookupJob.attempts + 1,
+                        locked_until=lease_expiry(),
+                        updated_at=func.now(),
+                    )
+                    .returning(LookupJob.id, LookupJob.startup_url, LookupJob.attempts)
+                )
+            ).first()
+            await session.commit()
+        return tuple(claimed) if claimed else None
+
+    async def report(self, job_id: int, progress: str):
+        async with async_session() as session:
+            await session.exec(
+                update(LookupJob)
+                .where(LookupJob.id == job_id)
+                .values(
+                    progress=progress,
+                    locked_until=lease_expiry(),
+                    updated_at=func.now(),
+                )
+            )
+            await session.commit()
+
+    async def finish(self, job_id: int, status: JobStatusEnum, **values):
+        async with async_session() as session:
+            await session.exec(
+                update(LookupJob)
+                .where(LookupJob.id == job_id)
+                .values(
+                    status=status, locked_until=None, updated_at=func.now(), **values
+                )
+            )
+            await session.commit()
+
+    async def run(self, job_id: int, startup_url: str, attempts: int):
+        if attempts > LOOKUP_MAX_ATTEMPTS:
+            await self.finish(
+                job_id,
+                JobStatusEnum.failed,
+                error=f"Interrupted {attempts - 1} times, giving up",
+            )
+            return
+        try:
+            async with async_session() as session:
+                startup = await self.handler(
+                    session, startup_url, partial(self.report, job_id)
+                )
+                startup_id = startup.id
+        except Exception as e:
+            await self.finish(job_id, JobStatusEnum.failed, error=str(e) or repr(e))
+            return
+        await self.finish(
+            job_id, JobStatusEnum.succeeded, progress="Done", startup_id=startup_id
+        )
+
+    async def _work(self):
+        while True:
+            try:
+                job = await self.claim()
+                if job:
+                    await self.run(*job)
+                    continue
+            except Exception as e:  # Database unavailable: back off and retry
+                print(f"Lookup worker error: {e}")
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), LOOKUP_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,114 @@
+import asyncio
+import json
+import os
+import time
+from typing import AsyncIterator, Awaitable, Optional
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+
+from api.metrics import record_llm_call
+
+# Load root .env
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), "..", ".env"))
+
+# Web-search responses take tens of seconds; cap how many run at once so they
+# cannot hog sockets or memory while cheap CRUD routes keep being served.
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+# Embeddings take well under a second and sit on CRUD paths (PUT /startups),
+# so they get their own slots instead of queueing behind web searches.
+EMBEDDING_MAX_CONCURRENCY = int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "4"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "180"))
+
+EMBEDDING_MODEL = "text-embedding-3-small"  # 1536 dims
+
+client = AsyncOpenAI(
+    api_key=os.getenv("OPENAI_API_KEY"),
+    timeout=LLM_TIMEOUT_SECONDS,
+)
+llm_slots = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+embedding_slots = asyncio.Semaphore(EMBEDDING_MAX_CONCURRENCY)
+
+
+async def timed_call(operation: str, call: Awaitable):
+    """Await an OpenAI `call`, recording its latency and token usage."""
+    start = time.perf_counter()
+    try:
+        response = await call
+    except Exception:
+        record_llm_call(operation, time.perf_counter() - start, outcome="error")
+        raise
+    usage = getattr(response, "usage", None)
+    record_llm_call(operation, time.perf_counter() - start, usage)
+    return response
+
+
+async def create_response(**kwargs):
+    """`client.responses.create` on the event loop, bounded by `llm_slots`."""
+    async with llm_slots:
+        return await timed_call("responses", client.responses.create(**kwargs))
+
+
+async def create_embeddings(texts: list[str]) -> list[list[float]]:
+    """Embed all `texts` in a single request, in input order."""
+    async with embedding_slots:
+        response = await timed_call(
+            "embeddings",
+            client.embeddings.create(model=EMBEDDING_MODEL, input=texts),
+        )
+    return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+
+
+async def stream_response(**kwargs) -> AsyncIterator:
+    """Events of a streamed `client.responses.create`, holding one slot."""
+    async with llm_slots:
+        start = time.perf_counter()
+        usage, outcome = None, "error"
+        try:
+            stream = await client.responses.create(stream=True, **kwargs)
+            async for event in stream:
+                if event.type == "response.completed":
+                    usage, outcome = event.response.usage, "ok"
+                yield event
+        finally:
+            elapsed = time.perf_counter() - start
+            record_llm_call("responses_stream", elapsed, usage, outcome)
+
+
+def parse_partial_json(text: str) -> Optional[dict]:
+    """
+    Best-effort parse of a JSON object that is still being generated: open
+    strings and brackets are closed, and an incomplete trailing member
+    (e.g. a key with no value yet) is dropped. None if nothing parses yet.
+    """
+    stack: list[str] = []
+    in_string = escape = False
+    cut = None  # (length, closers) just before the last complete member
+    for i, ch in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+            cut = (i + 1, "".join(reversed(stack)))
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+        elif ch == ",":
+            cut = (i, "".join(reversed(stack)))
+
+    completed = text[:-1] if escape else text
+    completed += ('"' if in_string else "") + "".join(reversed(stack))
+    attempts = [completed] + ([text[: cut[0]] + cut[1]] if cut else [])
+    for attempt in attempts:
+        try:
+            value = json.loads(attempt)
+        except json.JSONDecodeError:
+            continue
+        return value if isinstance(value, dict) else None
+    return None
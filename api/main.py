@@ -1,38 +1,70 @@
+import asyncio
 from contextlib import asynccontextmanager
-import os
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from openai import OpenAI
-from api.database import init_db
-from api.routers import evaluations, lookup, startups, workstreams, analyse
+from fastapi.responses import PlainTextResponse
+from api.context import get_encoding
+from api.database import PoolStats, async_session, init_db, pool_stats
+from api.llm import client as llm_client
+from api.metrics import METRICS_MEDIA_TYPE, MetricsMiddleware, render_metrics
+from api.profiling import ProfilingMiddleware
+from api.routers import evaluations, lookup, startups, workstreams, analyse, profiles
+from api.similarity import SIMILARITY_BACKEND, similarity_engine
 
 load_dotenv()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    init_db()  # Create tables on startup
+    await init_db()  # Create tables on startup
+    # tiktoken may download its BPE file on first use: not on the event loop
+    await asyncio.to_thread(get_encoding)
+    if SIMILARITY_BACKEND == "numpy":
+        async with async_session() as session:
+            await similarity_engine.load(session)
+    lookup.lookup_queue.start()  # Work queued LLM lookups in the background
     yield  # Run the app
-    # Cleanup logic (if any) on shutdown
+    await lookup.lookup_queue.stop()
+    await lookup.probe_client.aclose()
+    await llm_client.close()  # Release pooled OpenAI connections
 
 
 app = FastAPI(title="Startups API", lifespan=lifespan)
-client = OpenAI(
-    api_key=os.getenv("OPENAI_API_KEY"),
-)
 # Allow localhost:3000 (Next.js dev server)
 origins = ["http://localhost:3000", "http://127.0.0.1:3000"]
 
+app.add_middleware(MetricsMiddleware)  # Innermost: sees the matched route
+app.add_middleware(ProfilingMiddleware)  # Opt-in, see api/profiling.py
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,  # list of allowed origins
     allow_credentials=True,
     allow_methods=["*"],  # allow all HTTP methods (GET, POST, etc.)
     allow_headers=["*"],  # allow all headers
+    # Pagination and prompt size headers
+    expose_headers=[
+        "X-Total-Count",
+        "X-Next-Cursor",
+        "X-Prompt-Tokens",
+        "X-Profile-Id",
+    ],
 )
 app.include_router(startups.router, prefix="/startups")
 app.include_router(workstreams.router, prefix="/workstreams")
 app.include_router(evaluations.router, prefix="/evaluations")
 app.include_router(lookup.router, prefix="/lookup")
 app.include_router(analyse.router, prefix="/analyse")
+app.include_router(profiles.router, prefix="/profiles")
+
+
+@app.get("/db/pool", response_model=PoolStats)
+async def get_pool_stats():
+    """Connection pool usage of the worker process that answers."""
+    return pool_stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus metrics of the worker process that answers."""
+    return PlainTextResponse(render_metrics(), media_type=METRICS_MEDIA_TYPE)
@@ -0,0 +1,249 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+
+from api.database import engine, pool_stats
+
+# Prometheus text exposition (format 0.0.4) of per-process counters; scrape
+# every uvicorn worker, or run one worker per scrape target.
+METRICS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+BACKGROUND = "background"  # route label of work outside a request
+
+
+def escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def label_text(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name, self.help, self.labels = name, help, labels
+        self.values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{label_text(self.labels, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple = LATENCY_BUCKETS,
+    ):
+        self.name, self.help, self.labels, self.buckets = name, help, labels, buckets
+        self.values: dict[tuple, list] = {}  # labels -> [*bucket counts, sum, count]
+
+    def observe(self, *labels, value: float):
+        series = self.values.setdefault(labels, [0] * len(self.buckets) + [0.0, 0])
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self.values.items()):
+            for bound, count in zip(self.buckets, series):
+                le = label_text(self.labels, labels, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {count}")
+            le = label_text(self.labels, labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {series[-1]}")
+            lines.append(
+                f"{self.name}_sum{label_text(self.labels, labels)} {series[-2]}"
+            )
+            lines.append(
+                f"{self.name}_count{label_text(self.labels, labels)} {series[-1]}"
+            )
+        return lines
+
+
+request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Time until the last byte of the response was sent.",
+    ("method", "route", "status"),
+)
+request_db_queries = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed per request.",
+    ("method", "route"),
+    QUERY_COUNT_BUCKETS,
+)
+db_queries = Counter("db_queries_total", "SQL statements executed.", ("route",))
+db_seconds = Counter(
+    "db_query_seconds_total", "Time spent executing SQL statements.", ("route",)
+)
+llm_requests = Counter(
+    "openai_requests_total", "OpenAI API calls.", ("route", "operation", "outcome")
+)
+llm_duration = Histogram(
+    "openai_request_duration_seconds",
+    "Latency of OpenAI API calls, excluding the wait for an LLM slot.",
+    ("route", "operation"),
+)
+llm_tokens = Counter(
+    "openai_tokens_total",
+    "Tokens used by OpenAI API calls.",
+    ("route", "operation", "kind"),
+)
+METRICS = (
+    request_duration,
+    request_db_queries,
+    db_queries,
+    db_seconds,
+    llm_requests,
+    llm_duration,
+    llm_tokens,
+)
+
+
+def collect_templates(routes, prefix: str = "") -> dict[int, str]:
+    """Full path template of every route, keyed on the route's id()."""
+    templates = {}
+    for route in routes:
+        # Routers included with a prefix stay branches holding the original
+        # routes, whose own path lacks that prefix
+        included = getattr(route, "original_router", None)
+        if included is not None:
+            branch_prefix = prefix + route.include_context.prefix
+            templates.update(collect_templates(included.routes, branch_prefix))
+        elif hasattr(route, "path_format"):
+            templates[id(route)] = prefix + route.path_format
+    return templates
+
+
+route_templates: dict[int, str] = {}
+
+
+def route_template(scope: dict) -> str:
+    """Path template of the matched route, e.g. /workstreams/{workstream_id}."""
+    # The router stores its match in the (shared) scope
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    if id(route) not in route_templates:
+        # First request, or a route added since: map the app's routes again
+        route_templates.update(collect_templates(scope["app"].routes))
+    return route_templates.get(id(route), getattr(route, "path", "unmatched"))
+
+
+class RequestStats:
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.db_queries = 0
+
+    @property
+    def route(self) -> str:
+        return route_template(self.scope)
+
+
+# Shared by the tasks a request spawns (they copy the context, not the object)
+current_request: ContextVar[Optional[RequestStats]] = ContextVar(
+    "current_request", default=None
+)
+
+
+def current_route() -> str:
+    stats = current_request.get()
+    return stats.route if stats else BACKGROUND
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_start = time.perf_counter()
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def record_query(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._metrics_start
+    stats = current_request.get()
+    if stats:
+        stats.db_queries += 1
+    route = current_route()
+    db_queries.inc(route)
+    db_seconds.inc(route, amount=elapsed)
+
+
+def record_llm_call(
+    operation: str,
+    seconds: float,
+    usage=None,
+    outcome: str = "ok",
+):
+    """Record one OpenAI call; `usage` is the response's usage object if any."""
+    route = current_route()
+    llm_requests.inc(route, operation, outcome)
+    llm_duration.observe(route, operation, value=seconds)
+    if usage is None:
+        return
+    # Responses report input/output tokens, embeddings prompt tokens only
+    for kind, attr in (("input", "input_tokens"), ("input", "prompt_tokens")):
+        if getattr(usage, attr, None):
+            llm_tokens.inc(route, operation, kind, amount=getattr(usage, attr))
+    if getattr(usage, "output_tokens", None):
+        llm_tokens.inc(route, operation, "output", amount=usage.output_tokens)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing each HTTP request until its last body chunk, so
+    streamed responses count in full, and labelling SQL and OpenAI work done
+    on its behalf with the matched route.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        stats = RequestStats(scope)
+        token = current_request.set(stats)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_and_record(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_record)
+        finally:
+            current_request.reset(token)
+            method = scope["method"]
+            request_duration.observe(
+                method, stats.route, status, value=time.perf_counter() - start
+            )
+            request_db_queries.observe(method, stats.route, value=stats.db_queries)
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in METRICS:
+        lines += metric.render()
+    pool = pool_stats()
+    for field in ("checked_out", "checked_in", "overflow"):
+        lines.append(f"# TYPE db_pool_{field} gauge")
+        lines.append(f"db_pool_{field} {getattr(pool, field)}")
+    lines.append("# TYPE db_pool_checkout_timeouts_total counter")
+    lines.append(f"db_pool_checkout_timeouts_total {pool.timeouts}")
+    return "\n".join(lines) + "\n"
@@ -1,8 +1,10 @@
-from datetime import date
+from datetime import date, datetime
 from typing import Any, Optional, List, Dict
 from pydantic import HttpUrl, RootModel, BaseModel, field_validator
 from sqlmodel import Relationship, SQLModel, Field, Column, JSON, TypeDecorator
-from sqlalchemy.dialects.postgresql import ENUM
+from sqlalchemy import Computed, DateTime, Index, func, text
+from sqlalchemy.orm import deferred
+from sqlalchemy.dialects.postgresql import ENUM, TSVECTOR
 from pgvector.sqlalchemy import Vector
 import enum
 
@@ -40,6 +42,13 @@ class TrlEnum(str, enum.Enum):
     trl_8_9 = "TRL 8-9"
 
 
+class JobStatusEnum(str, enum.Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
 # -------------------- JSON Models --------------------
 class Founders(RootModel[dict[str, Optional[HttpUrl]]]):
     """Map of founder name -> website URL"""
@@ -208,18 +217,78 @@ class StartupBase(SQLModel):
 
 
 # -------------------- Table + Update --------------------
+# Embeddings are ~6 KB each and never returned by read models, so they are
+# deferred: plain loads skip them and only the similarity search touches them
+# (in SQL). Use `undefer_group(EMBEDDINGS_GROUP)` if Python really needs them.
+EMBEDDINGS_GROUP = "embeddings"
+_tech_embedding_column = Column("tech_embedding", Vector(1536))
+_uvp_embedding_column = Column("uvp_embedding", Vector(1536))
+
+# Weighted full-text document kept up to date by Postgres on every write.
+# Not a model field: it is only used in SQL by GET /startups/search.
+SEARCH_DOCUMENT_SQL = """
+setweight(to_tsvector('english'::regconfig, coalesce(company_name, '')), 'A') ||
+setweight(to_tsvector('english'::regconfig, coalesce(tech_offering, '')), 'B') ||
+setweight(to_tsvector('english'::regconfig, coalesce(uvp, '')), 'B') ||
+setweight(to_tsvector('english'::regconfig, coalesce(use_cases::text, '')), 'C') ||
+setweight(to_tsvector('english'::regconfig, coalesce(trl_explanation, '')), 'D')
+"""
+_search_vector_column = Column(
+    "search_vector", TSVECTOR, Computed(SEARCH_DOCUMENT_SQL, persisted=True)
+)
+
+
+# Host of `company_website` without scheme, "www.", port or path, as matched
+# by POST /lookup/check_urls. Queries must use this exact text to hit the index.
+WEBSITE_HOST_SQL = (
+    r"regexp_replace(lower(company_website), "
+    r"'^([a-z][a-z0-9+.-]*://)?(www\.)?([^/:?#]+).*$', '\3')"
+)
+
+
 class Startup(StartupBase, table=True):
     __tablename__ = "startups"
+    __table_args__ = (
+        _search_vector_column,
+        Index("ix_startups_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_startups_website_host", text(WEBSITE_HOST_SQL)),
+        # Keyset pagination order for GET /startups/
+        Index("ix_startups_company_name_id", "company_name", "id"),
+        # Approximate nearest neighbour search on cosine distance (<=>)
+        Index(
+            "ix_startups_tech_embedding_hnsw",
+            "tech_embedding",
+            postgresql_using="hnsw",
+            postgresql_ops={"tech_embedding": "vector_cosine_ops"},
+        ),
+        Index(
+            "ix_startups_uvp_embedding_hnsw",
+            "uvp_embedding",
+            postgresql_using="hnsw",
+            postgresql_ops={"uvp_embedding": "vector_cosine_ops"},
+        ),
+    )
+    __mapper_args__ = {
+        "properties": {
+            "tech_embedding": deferred(_tech_embedding_column, group=EMBEDDINGS_GROUP),
+            "uvp_embedding": deferred(_uvp_embedding_column, group=EMBEDDINGS_GROUP),
+            "search_vector": deferred(_search_vector_column),
+        }
+    }
     id: Optional[int] = Field(default=None, primary_key=True)
     evaluations: List["WorkstreamStartupEvaluation"] = Relationship(
         back_populates="startup",
-        sa_relationship_kwargs={"cascade": "all, delete-orphan"},
+        # Bulk deletes rely on the database's ON DELETE CASCADE
+        sa_relationship_kwargs={
+            "cascade": "all, delete-orphan",
+            "passive_deletes": True,
+        },
     )
     tech_embedding: Optional[List[float]] = Field(
-        default=None, sa_column=Column(Vector(1536))
+        default=None, sa_column=_tech_embedding_column
     )
     uvp_embedding: Optional[List[float]] = Field(
-        default=None, sa_column=Column(Vector(1536))
+        default=None, sa_column=_uvp_embedding_column
     )
 
 
@@ -248,7 +317,11 @@ class Workstream(WorkstreamBase, table=True):
     )
     evaluations: List["WorkstreamStartupEvaluation"] = Relationship(
         back_populates="workstream",
-        sa_relationship_kwargs={"cascade": "all, delete-orphan"},
+        # Bulk deletes rely on the database's ON DELETE CASCADE
+        sa_relationship_kwargs={
+            "cascade": "all, delete-orphan",
+            "passive_deletes": True,
+        },
     )
 
 
@@ -264,8 +337,102 @@ class WorkstreamStartupEvaluationUpdate(WorkstreamStartupEvaluationBase):
 
 class WorkstreamStartupEvaluation(WorkstreamStartupEvaluationBase, table=True):
     __tablename__ = "workstream_startup_evaluations"
+    __table_args__ = (
+        # The primary key leads with workstream_id; this serves the lookups by
+        # startup (GET /evaluations/?startup_id=, a startup's evaluations)
+        Index("ix_workstream_startup_evaluations_startup_id", "startup_id"),
+    )
 
-    workstream_id: int = Field(foreign_key="workstreams.id", primary_key=True)
-    startup_id: int = Field(foreign_key="startups.id", primary_key=True)
+    workstream_id: int = Field(
+        foreign_key="workstreams.id", primary_key=True, ondelete="CASCADE"
+    )
+    startup_id: int = Field(
+        foreign_key="startups.id", primary_key=True, ondelete="CASCADE"
+    )
     workstream: Workstream = Relationship(back_populates="evaluations")
     startup: Startup = Relationship(back_populates="evaluations")
+
+
+# -------------------- Caches --------------------
+class EmbeddingCache(SQLModel, table=True):
+    """Embeddings keyed on a hash of (model, text), shared by all workers"""
+
+    __tablename__ = "embedding_cache"
+
+    content_hash: str = Field(primary_key=True)
+    model: str
+    embedding: List[float] = Field(sa_column=Column(Vector(1536), nullable=False))
+
+
+class LLMResponseCache(SQLModel, table=True):
+    """Validated LLM output keyed on a hash of the full request, with a TTL"""
+
+    __tablename__ = "llm_response_cache"
+    __table_args__ = (
+        # Oldest-first eviction beyond the size limit
+        Index("ix_llm_response_cache_created_at", "created_at"),
+    )
+
+    cache_key: str = Field(primary_key=True)
+    model: str
+    output_text: str
+    created_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(
+            DateTime(timezone=True), server_default=func.now(), nullable=False
+        ),
+    )
+    expires_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+
+
+# -------------------- Jobs --------------------
+class LookupJob(SQLModel, table=True):
+    """
+    A queued LLM startup lookup. Workers claim rows with FOR UPDATE SKIP
+    LOCKED and hold them for a lease, so jobs outlive the process running them.
+    """
+
+    __tablename__ = "lookup_jobs"
+    __table_args__ = (
+        # Claim order for workers; finished jobs drop out of the index
+        Index(
+            "ix_lookup_jobs_pending",
+            "id",
+            postgresql_where=text("status IN ('queued', 'running')"),
+        ),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    startup_url: str
+    status: JobStatusEnum = Field(
+        default=JobStatusEnum.queued,
+        sa_column=Column(
+            ENUM(
+                JobStatusEnum,
+                name="job_status",
+                create_type=False,
+                values_callable=lambda obj: [e.value for e in obj],
+            ),
+            nullable=False,
+        ),
+    )
+    progress: Optional[str] = None
+    attempts: int = 0
+    error: Optional[str] = None
+    startup_id: Optional[int] = Field(
+        default=None, foreign_key="startups.id", ondelete="SET NULL"
+    )
+    locked_until: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True))
+    )
+    created_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), server_default=func.now()),
+    )
+    updated_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), server_default=func.now()),
+    )
+    startup: Optional[Startup] = Relationship()
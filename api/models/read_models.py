@@ -1,15 +1,26 @@
-from datetime import date
+from datetime import date, datetime
 from typing import List, Optional
+from sqlalchemy.orm import selectinload
 from sqlmodel import Column, Field, SQLModel
 
 from api.models.data_models import (
     Founders,
     FoundersType,
+    JobStatusEnum,
+    LookupJob,
+    Startup,
     StartupBase,
+    Workstream,
     WorkstreamBase,
+    WorkstreamStartupEvaluation,
     WorkstreamStartupEvaluationBase,
 )
 
+# Each read model that nests relationships declares `load_options()`: the eager
+# loading plan covering everything it serializes. Pass it to `.options(...)` /
+# `session.get(..., options=...)` so a response costs a fixed number of queries
+# instead of one lazy load per row and per evaluation.
+
 
 ########################################
 # Workstream with minimal startup info #
@@ -31,6 +42,14 @@ class WorkstreamReadLite(WorkstreamBase):
     create_date: date
     evaluations: List[EvaluationReadWithStartupLite] = []
 
+    @classmethod
+    def load_options(cls):
+        return [
+            selectinload(Workstream.evaluations).selectinload(
+                WorkstreamStartupEvaluation.startup
+            )
+        ]
+
 
 # Workstream upsert should be with startup lite
 class WorkstreamUpsert(WorkstreamBase):
@@ -55,6 +74,21 @@ class StartupReadLite(StartupBase):
     id: int
     evaluations: List[EvaluationReadWithWorkstreamLite] = []
 
+    @classmethod
+    def load_options(cls):
+        return [
+            selectinload(Startup.evaluations).selectinload(
+                WorkstreamStartupEvaluation.workstream
+            )
+        ]
+
+
+# Full-text search hit
+class StartupSearchResult(SQLModel):
+    startup: StartupReadLite
+    rank: float
+    snippet: Optional[str] = None
+
 
 #####################################
 # Workstream with full startup info #
@@ -62,12 +96,28 @@ class StartupReadLite(StartupBase):
 class EvaluationReadWithStartup(WorkstreamStartupEvaluationBase):
     startup: StartupReadLite
 
+    @classmethod
+    def load_options(cls):
+        return [
+            selectinload(WorkstreamStartupEvaluation.startup).options(
+                *StartupReadLite.load_options()
+            )
+        ]
+
 
 class WorkstreamRead(WorkstreamBase):
     id: int
     create_date: date
     evaluations: List[EvaluationReadWithStartup] = []
 
+    @classmethod
+    def load_options(cls):
+        return [
+            selectinload(Workstream.evaluations).options(
+                *EvaluationReadWithStartup.load_options()
+            )
+        ]
+
 
 #####################################
 # Startup with full workstream info #
@@ -79,3 +129,32 @@ class EvaluationReadWithWorkstream(WorkstreamStartupEvaluationBase):
 class StartupRead(StartupBase):
     id: int
     evaluations: List[EvaluationReadWithWorkstream] = []
+
+    @classmethod
+    def load_options(cls):
+        return [
+            selectinload(Startup.evaluations)
+            .selectinload(WorkstreamStartupEvaluation.workstream)
+            .options(*WorkstreamReadLite.load_options())
+        ]
+
+
+###############
+# Lookup jobs #
+###############
+class LookupJobRead(SQLModel):
+    id: int
+    startup_url: str
+    status: JobStatusEnum
+    progress: Optional[str] = None
+    attempts: int
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    startup: Optional[StartupReadLite] = None
+
+    @classmethod
+    def load_options(cls):
+        return [
+            selectinload(LookupJob.startup).options(*StartupReadLite.load_options())
+        ]
@@ -0,0 +1,127 @@
+import asyncio
+import cProfile
+import hashlib
+import os
+import random
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+from pydantic import BaseModel
+
+from api.metrics import route_template
+
+# Requests are profiled when they carry `X-Profile: <PROFILE_TOKEN>`, or at
+# random with probability PROFILE_SAMPLE_RATE. Only the slowest PROFILE_KEEP
+# profiles of each route are kept, as pstats files under PROFILE_DIR.
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", "profiles"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "5"))
+PROFILE_HEADER = "x-profile"
+
+
+class ProfileInfo(BaseModel):
+    id: str
+    method: str
+    route: str
+    path: str
+    status: int
+    duration_ms: float
+    created_at: datetime
+
+
+def profile_requested(scope: dict) -> bool:
+    if PROFILE_TOKEN:
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER.encode() and value.decode() == PROFILE_TOKEN:
+                return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def save_profile(profiler: cProfile.Profile, info: ProfileInfo):
+    """Store a profile in its route's directory, keeping the slowest ones."""
+    key = hashlib.sha1(f"{info.method} {info.route}".encode()).hexdigest()[:16]
+    route_dir = PROFILE_DIR / key
+    route_dir.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(route_dir / f"{info.id}.prof")
+    (route_dir / f"{info.id}.json").write_text(info.model_dump_json())
+
+    kept = sorted(
+        (
+            ProfileInfo.model_validate_json(p.read_text())
+            for p in route_dir.glob("*.json")
+        ),
+        key=lambda p: p.duration_ms,
+        reverse=True,
+    )
+    for stale in kept[PROFILE_KEEP:]:
+        (route_dir / f"{stale.id}.prof").unlink(missing_ok=True)
+        (route_dir / f"{stale.id}.json").unlink(missing_ok=True)
+
+
+def list_profiles() -> list[ProfileInfo]:
+    profiles = [
+        ProfileInfo.model_validate_json(p.read_text())
+        for p in PROFILE_DIR.glob("*/*.json")
+    ]
+    return sorted(profiles, key=lambda p: (p.route, p.method, -p.duration_ms))
+
+
+def profile_path(profile_id: str) -> Optional[Path]:
+    try:
+        profile_id = uuid.UUID(hex=profile_id).hex  # no path tricks
+    except ValueError:
+        return None
+    return next(PROFILE_DIR.glob(f"*/{profile_id}.prof"), None)
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware running opted-in requests under cProfile until their last
+    body chunk. The profiler sees the whole event loop, so other requests
+    served meanwhile show up too; one request is profiled at a time.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.busy = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.busy or not profile_requested(scope):
+            return await self.app(scope, receive, send)
+        self.busy = True
+        profile_id = uuid.uuid4().hex
+        status = 500
+
+        async def send_with_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", profile_id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profiler.disable()
+            self.busy = False
+            info = ProfileInfo(
+                id=profile_id,
+                method=scope["method"],
+                route=route_template(scope),
+                path=scope["path"],
+                status=status,
+                duration_ms=(time.perf_counter() - start) * 1000,
+                created_at=datetime.now(timezone.utc),
+            )
+            try:
+                await asyncio.to_thread(save_profile, profiler, info)
+            except OSError as e:
+                print(f"Could not save profile {profile_id}: {e}")
@@ -0,0 +1,82 @@
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy import delete, func, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select
+
+from api.database import async_session
+from api.embeddings import LRUCache
+from api.models.data_models import LLMResponseCache
+
+# Web-search answers go stale, so entries expire (default: one week)
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "256"))  # per process
+LLM_CACHE_MAX_ROWS = int(os.getenv("LLM_CACHE_MAX_ROWS", "10000"))  # in Postgres
+
+memory_cache = LRUCache(LLM_CACHE_SIZE)  # key -> (expires at, output text)
+
+
+def request_key(request: dict) -> str:
+    """
+    Hash of everything that shapes the answer: prompt (instructions), model,
+    reasoning settings, tools and input.
+    """
+    raw = json.dumps(request, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+async def get_cached_text(key: str) -> Optional[str]:
+    """Unexpired output text for `key`, from process memory then Postgres."""
+    hit = memory_cache.get(key)
+    if hit and hit[0] > time.time():
+        return hit[1]
+    async with async_session() as session:
+        row = (
+            await session.exec(
+                select(LLMResponseCache.expires_at, LLMResponseCache.output_text)
+                .where(LLMResponseCache.cache_key == key)
+                .where(LLMResponseCache.expires_at > func.now())
+            )
+        ).first()
+    if not row:
+        return None
+    memory_cache.put(key, (row[0].timestamp(), row[1]))
+    return row[1]
+
+
+async def put_cached_text(key: str, model: str, output_text: str):
+    """Store `output_text`, then drop expired rows and the oldest over the limit."""
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=LLM_CACHE_TTL_SECONDS)
+    memory_cache.put(key, (expires_at.timestamp(), output_text))
+    async with async_session() as session:
+        statement = insert(LLMResponseCache).values(
+            cache_key=key, model=model, output_text=output_text, expires_at=expires_at
+        )
+        await session.exec(
+            statement.on_conflict_do_update(
+                index_elements=[LLMResponseCache.cache_key],
+                set_={
+                    "output_text": statement.excluded.output_text,
+                    "created_at": func.now(),
+                    "expires_at": statement.excluded.expires_at,
+                },
+            )
+        )
+        overflow = (
+            select(LLMResponseCache.cache_key)
+            .order_by(LLMResponseCache.created_at.desc())
+            .offset(LLM_CACHE_MAX_ROWS)
+        )
+        await session.exec(
+            delete(LLMResponseCache).where(
+                or_(
+                    LLMResponseCache.expires_at <= func.now(),
+                    LLMResponseCache.cache_key.in_(overflow),
+                )
+            )
+        )
+        await session.commit()
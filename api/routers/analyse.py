@@ -1,60 +1,63 @@
+import asyncio
 import json
 import os
 from typing import List, Optional
-from dotenv import load_dotenv
-from fastapi import APIRouter, Depends, HTTPException, Query
-from openai import OpenAI
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, ValidationError
 from sqlalchemy import func
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from api.database import get_session
+from api.context import build_workstream_context, count_tokens
+from api.database import async_session, get_session
+from api.embeddings import embed_texts
+from api.evaluations import save_evaluation
+from api.llm import create_response, parse_partial_json, stream_response
+from api.response_cache import get_cached_text, put_cached_text, request_key
+from api.search import (
+    HNSW_EF_SEARCH,
+    ensure_ef_search,
+    hybrid_scores,
+    nearest_startup_ids,
+)
+from api.similarity import SIMILARITY_BACKEND, similarity_engine
+from api.sse import SSE_HEADERS, SSE_MEDIA_TYPE, sse_event
 from api.models.data_models import (
     Startup,
+    Workstream,
     WorkstreamStartupEvaluation,
+    WorkstreamStartupEvaluationUpdate,
 )
 from api.models.read_models import StartupReadLite, WorkstreamRead
 
-load_dotenv()
-
 router = APIRouter()
 
-client = OpenAI(
-    api_key=os.getenv("OPENAI_API_KEY"),
-)
-
-
-def embed_text(text: str) -> list[float]:
-    response = client.embeddings.create(
-        model="text-embedding-3-small",  # 1536 dims
-        input=text,
-    )
-    return response.data[0].embedding
+SUGGESTION_MODEL = "gpt-5-mini"
+SUGGESTION_REASONING = {"effort": "low"}
+# Default drafts in flight per workstream (all responses share `llm_slots`)
+EVAL_DRAFT_CONCURRENCY = int(os.getenv("EVAL_DRAFT_CONCURRENCY", "4"))
 
 
-class SuggestWorkstreamResponse(BaseModel):
-    use_case: Optional[str] = None
-    challenge: Optional[str] = None
-    technologies: Optional[List[str]] = None
-    overall_recommendation: Optional[str] = None
+def read_prompt(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
 
 
-@router.get("/suggest/from_use_case", response_model=SuggestWorkstreamResponse)
-def suggest_from_use_case(use_case: str = Query(...)):
-    with open("api/suggest_from_use_case.txt", "r", encoding="utf-8") as f:
-        instruction = f.read()
-    input = f"{instruction} {use_case}"  # noqa: F841
-    response = client.responses.create(
-        model="gpt-5-mini",
-        reasoning={"effort": "low"},
+def suggestion_request(instruction: str, input: str) -> dict:
+    """Arguments of the web-search responses call behind every suggestion."""
+    return dict(
+        model=SUGGESTION_MODEL,
+        reasoning=SUGGESTION_REASONING,
         instructions=instruction,
         input=input,
         store=True,
         tools=[{"type": "web_search"}],
-        stream=False,
     )
-    suggestion = json.loads(response.output_text)
-    # suggestion = TEMP_EXPANSION  # TODO: remove placeholder
+
+
+def repair_suggestion(suggestion: dict, response_model: type[BaseModel]):
+    """Validate, dropping the fields the LLM got wrong; 500 if none are left."""
     parsed_suggestion = None
     while not parsed_suggestion:
         if len(suggestion) == 0:
@@ -62,7 +65,7 @@ def suggest_from_use_case(use_case: str = Query(...)):
                 status_code=500, detail="Unable to fetch a valid suggestion from LLM."
             )
         try:
-            parsed_suggestion = SuggestWorkstreamResponse.model_validate(suggestion)
+            parsed_suggestion = response_model.model_validate(suggestion)
         except ValidationError as e:
             e_locs = [err["loc"] for err in e.errors()]
             for keys_to_delete in e_locs:
@@ -76,39 +79,215 @@ def suggest_from_use_case(use_case: str = Query(...)):
     return parsed_suggestion
 
 
+def prompt_tokens(instruction: str, input: str) -> int:
+    return count_tokens(instruction) + count_tokens(input)
+
+
+async def complete_suggestion(
+    instruction: str,
+    input: str,
+    response_model: type[BaseModel],
+    refresh: bool = False,
+    response: Optional[Response] = None,
+):
+    """
+    Validated suggestion, served from the response cache unless `refresh`.
+    Only answers that pass validation are cached. The prompt size is
+    reported in the `X-Prompt-Tokens` header of `response`.
+    """
+    request = suggestion_request(instruction, input)
+    if response is not None:
+        response.headers["X-Prompt-Tokens"] = str(prompt_tokens(instruction, input))
+    key = request_key(request)
+    output_text = None if refresh else await get_cached_text(key)
+    if output_text is not None:
+        return repair_suggestion(json.loads(output_text), response_model)
+    llm_response = await create_response(**request, stream=False)
+    output_text = llm_response.output_text
+    suggestion = repair_suggestion(json.loads(output_text), response_model)
+    await put_cached_text(key, request["model"], output_text)
+    return suggestion
+
+
+def stream_suggestion(
+    instruction: str,
+    input: str,
+    response_model: type[BaseModel],
+    refresh: bool = False,
+) -> StreamingResponse:
+    """
+    Server-sent events for a suggestion while the model writes it:
+    `status` (request started with its prompt size, cache hit, web search
+    progress), `delta` (raw text), `partial` (fields parsed so far), then
+    `result` with the validated object, or `error`.
+    """
+    tokens = prompt_tokens(instruction, input)
+
+    async def events():
+        yield sse_event({"stage": "started", "prompt_tokens": tokens}, event="status")
+        text, fields = "", None
+        try:
+            request = suggestion_request(instruction, input)
+            key = request_key(request)
+            cached = None if refresh else await get_cached_text(key)
+            if cached is not None:
+                suggestion = repair_suggestion(json.loads(cached), response_model)
+                yield sse_event({"stage": "cached"}, event="status")
+                yield sse_event(suggestion.model_dump(mode="json"), event="result")
+                return
+            async for event in stream_response(**request):
+                if event.type == "response.output_text.delta":
+                    text += event.delta
+                    yield sse_event({"text": event.delta}, event="delta")
+                    partial = parse_partial_json(text)
+                    if partial and partial != fields:
+                        fields = partial
+                        yield sse_event(fields, event="partial")
+                elif event.type.startswith("response.web_search_call."):
+                    stage = "web_search_" + event.type.rsplit(".", 1)[-1]
+                    yield sse_event({"stage": stage}, event="status")
+                elif event.type in ("response.failed", "error"):
+                    raise RuntimeError("The LLM response failed")
+            suggestion = repair_suggestion(json.loads(text), response_model)
+            await put_cached_text(key, request["model"], text)
+            yield sse_event(suggestion.model_dump(mode="json"), event="result")
+        except HTTPException as e:
+            yield sse_event({"detail": e.detail}, event="error")
+        except Exception as e:
+            yield sse_event({"detail": str(e) or repr(e)}, event="error")
+
+    return StreamingResponse(events(), media_type=SSE_MEDIA_TYPE, headers=SSE_HEADERS)
+
+
+class SuggestWorkstreamResponse(BaseModel):
+    use_case: Optional[str] = None
+    challenge: Optional[str] = None
+    technologies: Optional[List[str]] = None
+    overall_recommendation: Optional[str] = None
+
+
+def use_case_prompt(use_case: str) -> tuple[str, str]:
+    instruction = read_prompt("api/suggest_from_use_case.txt")
+    return instruction, f"{instruction} {use_case}"
+
+
+@router.get("/suggest/from_use_case", response_model=SuggestWorkstreamResponse)
+async def suggest_from_use_case(
+    response: Response,
+    use_case: str = Query(...),
+    refresh: bool = Query(False, description="Skip the response cache"),
+):
+    return await complete_suggestion(
+        *use_case_prompt(use_case), SuggestWorkstreamResponse, refresh, response
+    )
+
+
+@router.get("/suggest/from_use_case/stream")
+async def stream_suggest_from_use_case(
+    use_case: str = Query(...),
+    refresh: bool = Query(False, description="Skip the response cache"),
+):
+    """`suggest_from_use_case` as server-sent events (see `stream_suggestion`)."""
+    return stream_suggestion(
+        *use_case_prompt(use_case), SuggestWorkstreamResponse, refresh
+    )
+
+
 @router.post(
     "/suggest/startups/from_technologies", response_model=list[StartupReadLite]
 )
-def suggest_startups_from_technologies(
+async def suggest_startups_from_technologies(
     workstream_id: int,
     technologies: list[str],
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     limit: int = 5,
 ):
-    # Generate embeddings for each input technology
-    query_vecs = [embed_text(t) for t in technologies]
+    # Generate embeddings for all input technologies in one batch
+    query_vecs = await embed_texts(technologies)
 
-    # Build a similarity expression: least distance across all query vectors
-    order_expr = func.least(
-        *[Startup.tech_embedding.op("<=>")(qv) for qv in query_vecs]
+    # Startups already linked to this workstream
+    evaluated_startups = set(
+        (
+            await session.exec(
+                select(WorkstreamStartupEvaluation.startup_id).where(
+                    WorkstreamStartupEvaluation.workstream_id == workstream_id
+                )
+            )
+        ).all()
     )
 
-    # Subquery of startups already linked to this workstream
+    # Indexed top-k per technology, merged on the least distance. Embeddings
+    # are only used in SQL, so they stay deferred and never reach Python.
+    if SIMILARITY_BACKEND == "numpy":
+        ranked_ids = [
+            sid
+            for sid, _ in similarity_engine.search(
+                "tech_embedding", query_vecs, limit, evaluated_startups
+            )
+        ]
+    else:
+        ranked_ids = await nearest_startup_ids(
+            session, Startup.tech_embedding, query_vecs, limit, evaluated_startups
+        )
+    startups = (
+        await session.exec(
+            select(Startup)
+            .where(Startup.id.in_(ranked_ids))
+            .options(*StartupReadLite.load_options())
+        )
+    ).all()
+    by_id = {startup.id: startup for startup in startups}
+    return [by_id[sid] for sid in ranked_ids if sid in by_id]
+
+
+@router.post("/suggest/startups/hybrid", response_model=list[StartupReadLite])
+async def suggest_startups_hybrid(
+    workstream_id: int,
+    technologies: list[str],
+    session: AsyncSession = Depends(get_session),
+    limit: int = 5,
+    tech_weight: float = Query(1.0, ge=0),
+    uvp_weight: float = Query(1.0, ge=0),
+    keyword_weight: float = Query(1.0, ge=0),
+):
+    """
+    Like `suggest_startups_from_technologies`, but ranks on tech similarity,
+    UVP similarity and keyword match together (weighted reciprocal rank
+    fusion), computed in a single SQL query.
+    """
+    query_vecs = await embed_texts(technologies)
     evaluated_startups = select(WorkstreamStartupEvaluation.startup_id).where(
         WorkstreamStartupEvaluation.workstream_id == workstream_id
     )
-
-    # Main query: exclude already-evaluated startups
+    candidates = max(HNSW_EF_SEARCH, limit)
+    try:
+        scores = hybrid_scores(
+            query_vecs,
+            " or ".join(technologies),
+            limit,
+            evaluated_startups,
+            tech_weight=tech_weight,
+            uvp_weight=uvp_weight,
+            keyword_weight=keyword_weight,
+            candidates=candidates,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    # HNSW drops the excluded startups after its scan, so it must yield enough
+    # rows for them to be filtered out of each vector signal
+    excluded = (
+        await session.exec(
+            select(func.count()).select_from(evaluated_startups.subquery())
+        )
+    ).one()
+    await ensure_ef_search(session, candidates + excluded)
     statement = (
         select(Startup)
-        .where(Startup.id.not_in(evaluated_startups))
-        .order_by(order_expr)
-        .limit(limit)
+        .join(scores, Startup.id == scores.c.id)
+        .options(*StartupReadLite.load_options())
+        .order_by(scores.c.score.desc(), Startup.id)
     )
-
-    # Execute and return
-    results = session.exec(statement).all()
-    return results
+    return (await session.exec(statement)).all()
 
 
 class SuggestStartupEvaluationResponse(BaseModel):
@@ -117,86 +296,180 @@ class SuggestStartupEvaluationResponse(BaseModel):
     collaboration_potential: Optional[str] = None
 
 
+def startup_eval_prompt(workstream: WorkstreamRead, company_name: str):
+    instruction = read_prompt("api/startup_evaluation.txt")
+    context = build_workstream_context(workstream, focus_company=company_name)
+    return (
+        instruction,
+        f"{instruction}\nWorkstream:{context.text}\nStart-up:{company_name}",
+    )
+
+
 @router.post(
     "/suggest/startup_eval/from_workstream",
     response_model=SuggestStartupEvaluationResponse,
 )
-def suggest_startup_eval_from_workstream(
+async def suggest_startup_eval_from_workstream(
     workstream: WorkstreamRead,
+    response: Response,
     company_name: str = Query(...),
+    refresh: bool = Query(False, description="Skip the response cache"),
 ):
-    with open("api/startup_evaluation.txt", "r", encoding="utf-8") as f:
-        instruction = f.read()
-    input = f"{instruction}\nWorkstream:{workstream}\nStart-up:{company_name}"
-    response = client.responses.create(
-        model="gpt-5-mini",
-        reasoning={"effort": "low"},
-        instructions=instruction,
-        input=input,
-        store=True,
-        tools=[{"type": "web_search"}],
-        stream=False,
+    return await complete_suggestion(
+        *startup_eval_prompt(workstream, company_name),
+        SuggestStartupEvaluationResponse,
+        refresh,
+        response,
     )
-    suggestion = json.loads(response.output_text)
-    parsed_suggestion = None
-    while not parsed_suggestion:
-        if len(suggestion) == 0:
-            raise HTTPException(
-                status_code=500, detail="Unable to fetch a valid suggestion from LLM."
-            )
-        try:
-            parsed_suggestion = SuggestStartupEvaluationResponse.model_validate(
-                suggestion
-            )
-        except ValidationError as e:
-            e_locs = [err["loc"] for err in e.errors()]
-            for keys_to_delete in e_locs:
-                if (len(keys_to_delete)) == 1:
-                    suggestion.pop(keys_to_delete[0])
-                else:
-                    target_dict = suggestion
-                    for key_to_delete in keys_to_delete[:-1]:
-                        target_dict = target_dict[key_to_delete]
-                    target_dict.pop(keys_to_delete[-1])
-    return parsed_suggestion
+
+
+@router.post("/suggest/startup_eval/from_workstream/stream")
+async def stream_suggest_startup_eval_from_workstream(
+    workstream: WorkstreamRead,
+    company_name: str = Query(...),
+    refresh: bool = Query(False, description="Skip the response cache"),
+):
+    """`suggest_startup_eval_from_workstream` as server-sent events."""
+    return stream_suggestion(
+        *startup_eval_prompt(workstream, company_name),
+        SuggestStartupEvaluationResponse,
+        refresh,
+    )
+
+
+def conclusion_prompt(workstream: WorkstreamRead) -> tuple[str, str]:
+    instruction = read_prompt("api/final_evaluation.txt")
+    context = build_workstream_context(workstream)
+    return instruction, f"{instruction}\nWorkstream:{context.text}"
 
 
 @router.post(
     "/suggest/conclusion/from_workstream",
     response_model=SuggestWorkstreamResponse,
 )
-def suggest_conclusion_from_workstream(
+async def suggest_conclusion_from_workstream(
     workstream: WorkstreamRead,
+    response: Response,
+    refresh: bool = Query(False, description="Skip the response cache"),
 ):
-    with open("api/final_evaluation.txt", "r", encoding="utf-8") as f:
-        instruction = f.read()
-    input = f"{instruction}\nWorkstream:{workstream}"
-    response = client.responses.create(
-        model="gpt-5-mini",
-        reasoning={"effort": "low"},
-        instructions=instruction,
-        input=input,
-        store=True,
-        tools=[{"type": "web_search"}],
-        stream=False,
+    return await complete_suggestion(
+        *conclusion_prompt(workstream), SuggestWorkstreamResponse, refresh, response
     )
-    suggestion = json.loads(response.output_text)
-    parsed_suggestion = None
-    while not parsed_suggestion:
-        if len(suggestion) == 0:
+
+
+@router.post("/suggest/conclusion/from_workstream/stream")
+async def stream_suggest_conclusion_from_workstream(
+    workstream: WorkstreamRead,
+    refresh: bool = Query(False, description="Skip the response cache"),
+):
+    """`suggest_conclusion_from_workstream` as server-sent events."""
+    return stream_suggestion(
+        *conclusion_prompt(workstream), SuggestWorkstreamResponse, refresh
+    )
+
+
+class DraftedEvaluation(BaseModel):
+    startup_id: int
+    company_name: Optional[str] = None
+    evaluation: SuggestStartupEvaluationResponse
+    saved: bool = False
+
+
+@router.post("/suggest/startup_evals/from_workstream/{workstream_id}")
+async def draft_startup_evals_for_workstream(
+    workstream_id: int,
+    startup_ids: Optional[list[int]] = Body(None),
+    persist: bool = Query(False, description="Save drafts as the evaluations"),
+    concurrency: int = Query(EVAL_DRAFT_CONCURRENCY, ge=1, le=16),
+    refresh: bool = Query(False, description="Skip the response cache"),
+):
+    """
+    Draft evaluations for every startup of a workstream (or `startup_ids`),
+    `concurrency` at a time. Each prompt holds the workstream context built
+    around its startup, which is always kept in full (`startup_eval_prompt`).
+    Server-sent events: `status` (prompt size), one `evaluation`
+    (`DraftedEvaluation`) or `error` per startup as it finishes, then `done`.
+    With `persist`, each draft is saved like PUT /evaluations/{ws}/{startup}.
+    """
+    # Not a request-scoped session: it would stay checked out until the
+    # stream of drafts ends, minutes later
+    async with async_session() as session:
+        db_workstream = await session.get(
+            Workstream, workstream_id, options=WorkstreamRead.load_options()
+        )
+        if not db_workstream:
+            raise HTTPException(status_code=404, detail="Workstream not found")
+        workstream = WorkstreamRead.model_validate(db_workstream)
+    targets = workstream.evaluations
+    if startup_ids is not None:
+        targets = [e for e in targets if e.startup.id in set(startup_ids)]
+        missing = set(startup_ids) - {e.startup.id for e in targets}
+        if missing:
             raise HTTPException(
-                status_code=500, detail="Unable to fetch a valid suggestion from LLM."
+                status_code=404,
+                detail=f"Startups not in workstream: {sorted(missing)}",
             )
+
+    slots = asyncio.Semaphore(concurrency)
+
+    def prompt_for(startup: StartupReadLite) -> tuple[str, str]:
+        # Each draft keeps its own startup in full, whatever the budget
+        return startup_eval_prompt(workstream, startup.company_name)
+
+    async def draft(startup: StartupReadLite) -> tuple[str, dict]:
+        """(event name, payload): an `evaluation`, or an `error` for this startup."""
         try:
-            parsed_suggestion = SuggestWorkstreamResponse.model_validate(suggestion)
-        except ValidationError as e:
-            e_locs = [err["loc"] for err in e.errors()]
-            for keys_to_delete in e_locs:
-                if (len(keys_to_delete)) == 1:
-                    suggestion.pop(keys_to_delete[0])
-                else:
-                    target_dict = suggestion
-                    for key_to_delete in keys_to_delete[:-1]:
-                        target_dict = target_dict[key_to_delete]
-                    target_dict.pop(keys_to_delete[-1])
-    return parsed_suggestion
+            async with slots:
+                # Token counting for the whole workstream: off the event loop
+                instruction, input = await asyncio.to_thread(prompt_for, startup)
+                suggestion = await complete_suggestion(
+                    instruction, input, SuggestStartupEvaluationResponse, refresh
+                )
+            drafted = DraftedEvaluation(
+                startup_id=startup.id,
+                company_name=startup.company_name,
+                evaluation=suggestion,
+            )
+            if persist:
+                evaluation_update = WorkstreamStartupEvaluationUpdate.model_validate(
+                    suggestion.model_dump(exclude_unset=True)
+                )
+                async with async_session() as draft_session:
+                    await save_evaluation(
+                        draft_session, workstream_id, startup.id, evaluation_update
+                    )
+                drafted.saved = True
+            return "evaluation", drafted.model_dump(mode="json")
+        except Exception as e:
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            return "error", {
+                "startup_id": startup.id,
+                "company_name": startup.company_name,
+                "detail": detail or repr(e),
+            }
+
+    async def events():
+        tokens = 0
+        if targets:  # Every prompt is fitted to the same budget
+            first = await asyncio.to_thread(prompt_for, targets[0].startup)
+            tokens = prompt_tokens(*first)
+        yield sse_event(
+            {"stage": "started", "startups": len(targets), "prompt_tokens": tokens},
+            event="status",
+        )
+        tasks = [asyncio.create_task(draft(e.startup)) for e in targets]
+        counts = {"evaluation": 0, "error": 0}
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                event, payload = await next_done
+                counts[event] += 1
+                yield sse_event(payload, event=event)
+            yield sse_event(
+                {"drafted": counts["evaluation"], "failed": counts["error"]},
+                event="done",
+            )
+        finally:
+            for task in tasks:  # Client went away: stop paying for drafts
+                task.cancel()
+
+    return StreamingResponse(events(), media_type=SSE_MEDIA_TYPE, headers=SSE_HEADERS)
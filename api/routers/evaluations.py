@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import ValidationError
-from sqlmodel import Session, select
+from sqlalchemy import delete
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
 
+from api.bulk import any_id, link_startups
 from api.database import get_session
+from api.evaluations import save_evaluation
 from api.models.data_models import (
-    Startup,
     Workstream,
     WorkstreamStartupEvaluation,
     WorkstreamStartupEvaluationUpdate,
@@ -16,61 +19,60 @@ router = APIRouter(tags=["evaluations"])
 
 
 @router.post("/", response_model=WorkstreamStartupEvaluation)
-def create_evaluation(
-    evaluation: WorkstreamStartupEvaluation, session: Session = Depends(get_session)
+async def create_evaluation(
+    evaluation: WorkstreamStartupEvaluation,
+    session: AsyncSession = Depends(get_session),
 ):
     evaluation = WorkstreamStartupEvaluation.model_validate(evaluation)
     session.add(evaluation)
-    session.commit()
-    session.refresh(evaluation)
+    await session.commit()
+    await session.refresh(evaluation)
     return evaluation
 
 
 @router.post("/{workstream_id}", response_model=WorkstreamRead)
-def create_evaluations_bulk(
+async def create_evaluations_bulk(
     workstream_id: int,
     startup_ids: list[int],
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
-    db_workstream = session.get(Workstream, workstream_id)
+    db_workstream = await session.get(Workstream, workstream_id)
     if not db_workstream:
         raise HTTPException(status_code=404, detail="Workstream not found")
-    # Create evaluations for each startup
-    for sid in startup_ids:
-        startup = session.get(Startup, sid)
-        if not startup:
-            raise HTTPException(status_code=404, detail=f"Startup {sid} not found")
-        evaluation = WorkstreamStartupEvaluation(
-            workstream=db_workstream,
-            startup=startup,
-        )
-        session.add(evaluation)
-    session.add(evaluation)
-    session.commit()
-    session.refresh(db_workstream)
-    return db_workstream
+    # Link all startups in one statement; existing links are left as they are
+    missing = await link_startups(session, workstream_id, startup_ids)
+    if missing:
+        await session.rollback()
+        raise HTTPException(status_code=404, detail=f"Startup {min(missing)} not found")
+    await session.commit()
+    session.expunge_all()  # Reload through the read model's loading plan
+    return await session.get(
+        Workstream,
+        workstream_id,
+        options=WorkstreamRead.load_options(),
+    )
 
 
 @router.get("/", response_model=List[WorkstreamStartupEvaluation])
-def list_evaluations(
+async def list_evaluations(
     workstream_id: int | None = None,
     startup_id: int | None = None,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     query = select(WorkstreamStartupEvaluation)
     if workstream_id:
         query = query.where(WorkstreamStartupEvaluation.workstream_id == workstream_id)
     if startup_id:
         query = query.where(WorkstreamStartupEvaluation.startup_id == startup_id)
-    return session.exec(query).all()
+    return (await session.exec(query)).all()
 
 
 @router.put("/{workstream_id}/{startup_id}", response_model=EvaluationReadWithStartup)
-def upsert_evaluations(
+async def upsert_evaluations(
     workstream_id: int,
     startup_id: int,
     evaluation: WorkstreamStartupEvaluationUpdate,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     try:
         WorkstreamStartupEvaluationUpdate.model_validate(evaluation)
@@ -79,37 +81,35 @@ def upsert_evaluations(
             status_code=422, detail="Evaluation update data format is invalid"
         )
 
-    db_eval = session.get(WorkstreamStartupEvaluation, (workstream_id, startup_id))
-    if not db_eval:
-        db_startup = session.get(Startup, startup_id)
-        if not db_startup:
-            raise HTTPException(status_code=404, detail="Start-up not found")
-        db_workstream = session.get(Workstream, workstream_id)
-        if not db_workstream:
-            raise HTTPException(status_code=404, detail="Workstream not found")
-        db_eval = WorkstreamStartupEvaluation(
-            workstream=db_workstream, startup=db_startup
-        )
-
-    update_data = evaluation.model_dump(exclude_unset=True)
-    db_eval.sqlmodel_update(update_data)
-    session.add(db_eval)
-    session.commit()
-    session.refresh(db_eval)
-    return db_eval
+    await save_evaluation(session, workstream_id, startup_id, evaluation)
+    session.expunge_all()  # Reload through the read model's loading plan
+    return await session.get(
+        WorkstreamStartupEvaluation,
+        (workstream_id, startup_id),
+        options=EvaluationReadWithStartup.load_options(),
+    )
 
 
 @router.delete("/{workstream_id}", response_model=dict)
-def delete_evaluations_bulk(
+async def delete_evaluations_bulk(
     workstream_id: int,
     startup_ids: list[int],
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
-    # Delete evaluations for each startup
-    for sid in startup_ids:
-        db_eval = session.get(WorkstreamStartupEvaluation, (workstream_id, sid))
-        if not db_eval:
-            raise HTTPException(status_code=404, detail=f"Startup {sid} not found")
-        session.delete(db_eval)
-    session.commit()
+    if not startup_ids:
+        return {"deleted": True}
+    deleted = await session.exec(
+        delete(WorkstreamStartupEvaluation)
+        .where(
+            WorkstreamStartupEvaluation.workstream_id == workstream_id,
+            any_id(WorkstreamStartupEvaluation.startup_id, startup_ids),
+        )
+        .returning(WorkstreamStartupEvaluation.startup_id)
+        .execution_options(synchronize_session=False)
+    )
+    missing = set(startup_ids) - set(deleted.scalars().all())
+    if missing:
+        await session.rollback()
+        raise HTTPException(status_code=404, detail=f"Startup {min(missing)} not found")
+    await session.commit()
     return {"deleted": True}
@@ -1,30 +1,56 @@
+import asyncio
 import httpx
 import ipaddress
 import json
 import os
-import socket
+import time
 from dotenv import load_dotenv
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Body, HTTPException, Query
 from fastapi import Depends
-from openai import OpenAI
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, ValidationError
-from sqlmodel import Session
-from typing import Optional
+from sqlalchemy import literal_column
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Annotated, Optional
 from urllib.parse import urlparse
 
-from api.database import get_session
-from api.models.data_models import Startup, StartupUpsert
-from api.models.read_models import StartupReadLite
+from api.database import async_session, get_session
+from api.embeddings import LRUCache, embed_startup_fields
+from api.jobs import FINISHED_STATUSES, LOOKUP_POLL_SECONDS, LookupJobQueue, Report
+from api.similarity import similarity_engine
+from api.llm import create_response
+from api.models.data_models import (
+    WEBSITE_HOST_SQL,
+    LookupJob,
+    Startup,
+    StartupUpsert,
+)
+from api.models.read_models import LookupJobRead, StartupReadLite
+from api.sse import SSE_HEADERS, SSE_MEDIA_TYPE, sse_comment, sse_event
 
 load_dotenv()
 
 router = APIRouter()
 
-client = OpenAI(
-    api_key=os.getenv("OPENAI_API_KEY"),
-)
-
 CA_CERT_PATH = os.getenv("CA_CERT_PATH", None)
+# Every candidate URL of a domain is probed at once, so this bounds a check
+PROBE_TIMEOUT_SECONDS = float(os.getenv("PROBE_TIMEOUT_SECONDS", "3"))
+CHECK_URL_CACHE_TTL_SECONDS = int(os.getenv("CHECK_URL_CACHE_TTL_SECONDS", "3600"))
+
+# Shared, connection-pooled client for domain probes (closed on shutdown)
+probe_client = httpx.AsyncClient(
+    timeout=PROBE_TIMEOUT_SECONDS,
+    follow_redirects=True,
+    verify=False,  # TODO: DANGEROUS! Temporarily disable SSL check
+    # verify=CA_CERT_PATH or True,
+    limits=httpx.Limits(max_connections=200, max_keepalive_connections=50),
+)
+probe_cache = LRUCache(4096)  # hostname -> (expires at, CheckDomainResponse)
+# Probes in flight for POST /check_urls, shared by all requests
+CHECK_URLS_CONCURRENCY = int(os.getenv("CHECK_URLS_CONCURRENCY", "50"))
+CHECK_URLS_MAX = 10000
+probe_slots = asyncio.Semaphore(CHECK_URLS_CONCURRENCY)
 
 
 class CheckDomainResponse(BaseModel):
@@ -35,58 +61,57 @@ class CheckDomainResponse(BaseModel):
     hostname: Optional[str] = None
 
 
-def is_public_ip(hostname: str) -> bool:
-    """Check if hostname resolves to a public IP address."""
+async def is_public_ip(hostname: str) -> bool:
+    """Check if hostname resolves to public IP addresses only."""
     try:
-        ip = socket.gethostbyname(hostname)
-        ip_obj = ipaddress.ip_address(ip)
-        return not (
+        infos = await asyncio.get_running_loop().getaddrinfo(hostname, None)
+        ips = {ipaddress.ip_address(info[4][0]) for info in infos}
+        return bool(ips) and not any(
             ip_obj.is_private
             or ip_obj.is_loopback
             or ip_obj.is_link_local
             or ip_obj.is_multicast
             or ip_obj.is_reserved
+            for ip_obj in ips
         )
     except Exception:
         return False
 
 
-async def try_protocols(hostname: str) -> Optional[str]:
-    """Try HTTPS first, then HTTP, return working URL or None."""
-
-    async def check_url(url: str) -> Optional[str]:
-        async with httpx.AsyncClient(
-            timeout=3,
-            follow_redirects=True,
-            verify=False,  # TODO: DANGEROUS! Temporarily disable SSL check
-            # verify=CA_CERT_PATH or True,
-        ) as client:
-            try:
-                resp = await client.head(url)
-                if resp.status_code < 400:
-                    return url
-                if resp.status_code in (403, 405):  # Forbidden or Method Not Allowed
-                    resp = await client.get(url)
-                    if resp.status_code < 400:
-                        return url
-            except Exception:
-                return None
+async def probe_url(url: str) -> Optional[str]:
+    """Return `url` if it answers with a non-error status, else None."""
+    try:
+        resp = await probe_client.head(url)
+        if resp.status_code < 400:
+            return url
+        if resp.status_code in (403, 405):  # Forbidden or Method Not Allowed
+            resp = await probe_client.get(url)
+            if resp.status_code < 400:
+                return url
+    except Exception:
         return None
+    return None
 
-    # Try HTTPS
-    https_url = f"https://{hostname}"
-    result = await check_url(https_url)
-    if result:
-        return result
 
-    # Try HTTP
-    http_url = f"http://{hostname}"
-    return await check_url(http_url)
+async def first_reachable(urls: list[str]) -> Optional[str]:
+    """Probe all `urls` at once; the first to answer wins, within one timeout."""
+    tasks = [asyncio.create_task(probe_url(url)) for url in urls]
+    try:
+        async with asyncio.timeout(PROBE_TIMEOUT_SECONDS):
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                if result:
+                    return result
+    except TimeoutError:
+        pass
+    finally:
+        for task in tasks:
+            task.cancel()
+    return None
 
 
-@router.get("/check_url", response_model=CheckDomainResponse)
-async def check_url(url: str = Query(...)):
-    """Validate URL, prefer root domain but fallback to www if needed."""
+async def check_domain(url: str) -> CheckDomainResponse:
+    """Validate URL, probing www and root over HTTPS and HTTP in parallel."""
     response = CheckDomainResponse(
         exists=False, normalized=None, error=None, note=None, hostname=None
     )
@@ -99,34 +124,34 @@ async def check_url(url: str = Query(...)):
             return response
         response.hostname = hostname
 
+        cached = probe_cache.get(hostname)
+        if cached and cached[0] > time.monotonic():
+            return cached[1].model_copy()
+
         # Block private/internal IPs
-        if not is_public_ip(hostname):
+        if not await is_public_ip(hostname):
             response.error = "Only public IPs are allowed"
             return response
 
-        # Strip www. for root preference
+        # Strip www. and race both hostnames over both protocols
         root_hostname = hostname[4:] if hostname.startswith("www.") else hostname
-
-        # Try with www first
         www_hostname = "www." + root_hostname
-        www_result = await try_protocols(www_hostname)
-        if www_result:
-            response.exists = True
-            response.normalized = www_result
-            response.hostname = www_hostname
-            return response
-
-        # If www fails, try root
-        root_result = await try_protocols(root_hostname)
-        if root_result:
-            response.exists = True
-            response.normalized = root_result
-            response.hostname = root_hostname
-            return response
-
-        # Domain resolves but no web service
+        result = await first_reachable(
+            [
+                f"{protocol}://{candidate}"
+                for candidate in (www_hostname, root_hostname)
+                for protocol in ("https", "http")
+            ]
+        )
         response.exists = True
-        response.note = "Domain resolves but no HTTP(S) service found"
+        if result:
+            response.normalized = result
+            response.hostname = urlparse(result).hostname
+        else:
+            # Domain resolves but no web service
+            response.note = "Domain resolves but no HTTP(S) service found"
+        expires = time.monotonic() + CHECK_URL_CACHE_TTL_SECONDS
+        probe_cache.put(hostname, (expires, response.model_copy()))
         return response
 
     except Exception as e:
@@ -134,14 +159,109 @@ async def check_url(url: str = Query(...)):
         return response
 
 
-@router.get("/query_llm", response_model=StartupReadLite)
-def lookup_startup(
-    startup_url: str = Query(...), session: Session = Depends(get_session)
+@router.get("/check_url", response_model=CheckDomainResponse)
+async def check_url(url: str = Query(...)):
+    """Validate URL, prefer root domain but fallback to www if needed."""
+    return await check_domain(url)
+
+
+class BulkCheckDomainResponse(CheckDomainResponse):
+    url: str
+    existing_startup_id: Optional[int] = None
+
+
+def root_hostname_of(url: str) -> Optional[str]:
+    hostname = urlparse(url if "://" in url else f"https://{url}").hostname
+    if not hostname:
+        return None
+    return hostname[4:] if hostname.startswith("www.") else hostname
+
+
+# Inlined rather than bound, so the planner matches ix_startups_website_host
+website_host = literal_column(WEBSITE_HOST_SQL)
+
+
+@router.post("/check_urls")
+async def check_urls(
+    urls: Annotated[list[str], Body(max_length=CHECK_URLS_MAX)],
 ):
+    """
+    Validate many URLs at once. They are deduplicated by hostname (ignoring
+    "www."); hosts already saved as a startup's website are reported with
+    `existing_startup_id` instead of being probed. The rest are checked like
+    GET /lookup/check_url, at most CHECK_URLS_CONCURRENCY at a time across all
+    requests, and streamed back as NDJSON lines in completion order.
+    """
+    unique: dict[str, str] = {}  # root hostname -> first url given for it
+    invalid = []
+    for url in urls:
+        try:
+            host = root_hostname_of(url.strip())
+        except ValueError:
+            host = None
+        if host is None:
+            invalid.append(url)
+        else:
+            unique.setdefault(host, url)
+
+    existing: dict[str, int] = {}  # root hostname -> startup id
+    if unique:
+        # Own session: a request-scoped one stays checked out until the NDJSON
+        # stream of probes ends
+        async with async_session() as session:
+            rows = await session.exec(
+                select(website_host, Startup.id).where(website_host.in_(list(unique)))
+            )
+            existing = dict(rows.all())
+
+    async def check(url: str) -> BulkCheckDomainResponse:
+        async with probe_slots:
+            result = await check_domain(url)
+        return BulkCheckDomainResponse(url=url, **result.model_dump())
+
+    async def lines():
+        for url in invalid:
+            result = BulkCheckDomainResponse(
+                url=url, exists=False, error="Invalid hostname"
+            )
+            yield result.model_dump_json() + "\n"
+        for host, startup_id in existing.items():
+            result = BulkCheckDomainResponse(
+                url=unique[host],
+                exists=True,
+                hostname=host,
+                note="Already saved as a startup",
+                existing_startup_id=startup_id,
+            )
+            yield result.model_dump_json() + "\n"
+        tasks = [
+            asyncio.create_task(check(url))
+            for host, url in unique.items()
+            if host not in existing
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield (await next_done).model_dump_json() + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+async def report_nothing(progress: str):
+    pass
+
+
+async def lookup_and_save(
+    session: AsyncSession, startup_url: str, report: Report = report_nothing
+) -> Startup:
+    """Research `startup_url` with the LLM and insert the resulting startup."""
     with open("api/instruction.txt", "r", encoding="utf-8") as f:
         instruction = f.read()
     input = f"{'; '.join(startup_url)}"
-    response = client.responses.create(
+    await report("Researching the startup")
+    response = await create_response(
         model="gpt-5-mini",
         reasoning={"effort": "low"},
         instructions=instruction,
@@ -150,6 +270,7 @@ def lookup_startup(
         tools=[{"type": "web_search"}],
         stream=False,
     )
+    await report("Validating the profile")
     startup_info = json.loads(response.output_text)
     try:
         with open("tmp_output.json", "w") as json_file:
@@ -172,16 +293,84 @@ def lookup_startup(
                         target_dict = target_dict[key_to_delete]
                     target_dict.pop(keys_to_delete[-1])
     startup.company_website = startup_url
-    startup = Startup(**startup.model_dump())
-    if startup.tech_offering:
-        startup.tech_embedding = (
-            client.embeddings.create(
-                model="text-embedding-3-small", input=startup.tech_offering
-            )
-            .data[0]
-            .embedding
-        )
+    startup_data = startup.model_dump()
+    await report("Embedding the profile")
+    embeddings = await embed_startup_fields(startup_data)
+    await report("Saving the startup")
+    startup = Startup(**startup_data, **embeddings)
     session.add(startup)
-    session.commit()
-    session.refresh(startup)  # Fetch updated startup
+    await session.commit()
+    similarity_engine.update_startup(startup.id, **embeddings)
     return startup
+
+
+lookup_queue = LookupJobQueue(lookup_and_save)
+
+
+@router.get("/query_llm", response_model=StartupReadLite)
+async def lookup_startup(
+    startup_url: str = Query(...), session: AsyncSession = Depends(get_session)
+):
+    """Synchronous lookup; prefer POST /lookup/jobs for anything user-facing."""
+    startup = await lookup_and_save(session, startup_url)
+    session.expunge_all()  # Reload through the read model's loading plan
+    return await session.get(
+        Startup,
+        startup.id,
+        options=StartupReadLite.load_options(),
+    )
+
+
+async def get_job(session: AsyncSession, job_id: int) -> LookupJob:
+    job = await session.get(LookupJob, job_id, options=LookupJobRead.load_options())
+    if not job:
+        raise HTTPException(status_code=404, detail="Lookup job not found")
+    return job
+
+
+@router.post("/jobs", response_model=LookupJobRead, status_code=202)
+async def create_lookup_job(
+    startup_url: str = Query(...), session: AsyncSession = Depends(get_session)
+):
+    """
+    Queue an LLM lookup of `startup_url` and return at once. Follow it with
+    GET /lookup/jobs/{id} or the event stream at /lookup/jobs/{id}/events.
+    """
+    job = await lookup_queue.enqueue(session, startup_url)
+    session.expunge_all()  # Reload through the read model's loading plan
+    return await get_job(session, job.id)
+
+
+@router.get("/jobs/{job_id}", response_model=LookupJobRead)
+async def get_lookup_job(job_id: int, session: AsyncSession = Depends(get_session)):
+    return await get_job(session, job_id)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_lookup_job(job_id: int):
+    """
+    Server-sent `job` events carrying the `LookupJobRead` payload whenever
+    the job changes, until it succeeds or fails.
+    """
+    # No request-scoped session: a dependency is only closed once the stream
+    # ends, so it would hold a pooled connection for the job's whole lifetime
+    async with async_session() as session:
+        await get_job(session, job_id)  # 404 before the stream starts
+
+    async def events():
+        last = None
+        while True:
+            # One short-lived session per poll, released while sleeping
+            async with async_session() as poll_session:
+                job = await get_job(poll_session, job_id)
+                payload = LookupJobRead.model_validate(job).model_dump_json()
+            if payload != last:
+                yield sse_event(payload, event="job")
+                last = payload
+            else:
+                yield sse_comment()
+            if job.status in FINISHED_STATUSES:
+                return
+            await asyncio.sleep(LOOKUP_POLL_SECONDS)
+
+    return StreamingResponse(events(), media_type=SSE_MEDIA_TYPE, headers=SSE_HEADERS)
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import FileResponse
+from typing import List, Optional
+
+from api.profiling import (
+    PROFILE_TOKEN,
+    ProfileInfo,
+    list_profiles,
+    profile_path,
+)
+
+router = APIRouter(tags=["profiles"])
+
+
+def check_profile_token(x_profile: Optional[str] = Header(None)):
+    # Profiles reveal code internals: require the token when one is set
+    if PROFILE_TOKEN and x_profile != PROFILE_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid profile token")
+
+
+@router.get(
+    "/", response_model=List[ProfileInfo], dependencies=[Depends(check_profile_token)]
+)
+async def get_profiles():
+    """Kept request profiles, slowest first within each route."""
+    return list_profiles()
+
+
+@router.get("/{profile_id}", dependencies=[Depends(check_profile_token)])
+async def download_profile(profile_id: str):
+    """
+    The pstats file of a profile: open it with `python -m pstats`, or render
+    it with snakeviz / flameprof.
+    """
+    path = profile_path(profile_id)
+    if not path:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(
+        path, media_type="application/octet-stream", filename=f"{profile_id}.prof"
+    )
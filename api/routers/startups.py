@@ -1,79 +1,286 @@
-from dotenv import load_dotenv
-from fastapi import APIRouter, HTTPException, Query
+import base64
+import binascii
+import json
+from fastapi import APIRouter, HTTPException, Query, Response
 from fastapi import Depends
-from openai import OpenAI
-import os
-from sqlmodel import Session, select
+from typing import List, Optional
+from sqlalchemy import and_, delete, func, or_, tuple_
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from api.bulk import any_id
 from api.database import get_session
-from api.models.data_models import Startup, StartupUpsert
-from api.models.read_models import StartupReadLite
-
-load_dotenv()
+from api.embeddings import EMBEDDED_FIELDS, embed_startup_fields
+from api.export import ExportFormat, export_response
+from api.similarity import EMBEDDING_COLUMNS, similarity_engine
+from api.models.data_models import (
+    FundingStageEnum,
+    FundsRaisedEnum,
+    NumEmployeesEnum,
+    Startup,
+    StartupUpsert,
+    TrlEnum,
+)
+from api.models.read_models import StartupReadLite, StartupSearchResult
 
 router = APIRouter()
 
-client = OpenAI(
-    api_key=os.getenv("OPENAI_API_KEY"),
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+SEARCH_HEADLINE_OPTIONS = (
+    "MaxFragments=2, MaxWords=30, MinWords=10, StartSel=<mark>, StopSel=</mark>"
 )
 
 
+def encode_cursor(company_name: Optional[str], startup_id: int) -> str:
+    """Opaque keyset cursor pointing at the last row of a page."""
+    raw = json.dumps([company_name, startup_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[Optional[str], int]:
+    try:
+        company_name, startup_id = json.loads(base64.urlsafe_b64decode(cursor))
+        if company_name is not None and not isinstance(company_name, str):
+            raise ValueError
+        return company_name, int(startup_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def filter_startups(
+    statement,
+    name: Optional[str] = None,
+    country: Optional[List[str]] = None,
+    funding_stage: Optional[List[FundingStageEnum]] = None,
+    funds_raised: Optional[List[FundsRaisedEnum]] = None,
+    trl: Optional[List[TrlEnum]] = None,
+    num_employees: Optional[List[NumEmployeesEnum]] = None,
+):
+    """Apply the browse filters (each one an OR over its values) to a statement."""
+    if name:
+        # Case-insensitive substring of company_name, wildcards taken literally
+        pattern = name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        statement = statement.where(Startup.company_name.ilike(f"%{pattern}%"))
+    if country:
+        statement = statement.where(Startup.country.in_(country))
+    if funding_stage:
+        statement = statement.where(Startup.funding_stage.in_(funding_stage))
+    if funds_raised:
+        statement = statement.where(Startup.funds_raised.in_(funds_raised))
+    if trl:
+        statement = statement.where(Startup.trl.in_(trl))
+    if num_employees:
+        statement = statement.where(Startup.num_employees.in_(num_employees))
+    return statement
+
+
+def after_cursor(statement, cursor: str):
+    """Keyset condition for rows after the cursor in (company_name NULLS LAST, id)."""
+    company_name, startup_id = decode_cursor(cursor)
+    if company_name is None:
+        return statement.where(
+            and_(Startup.company_name.is_(None), Startup.id > startup_id)
+        )
+    return statement.where(
+        or_(
+            tuple_(Startup.company_name, Startup.id) > (company_name, startup_id),
+            Startup.company_name.is_(None),
+        )
+    )
+
+
 @router.get("/", response_model=list[StartupReadLite])
-def list_startups(session: Session = Depends(get_session)):
-    return session.exec(select(Startup).order_by(Startup.company_name)).all()
+async def list_startups(
+    response: Response,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    name: Optional[str] = Query(None),
+    country: Optional[List[str]] = Query(None),
+    funding_stage: Optional[List[FundingStageEnum]] = Query(None),
+    funds_raised: Optional[List[FundsRaisedEnum]] = Query(None),
+    trl: Optional[List[TrlEnum]] = Query(None),
+    num_employees: Optional[List[NumEmployeesEnum]] = Query(None),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    One page of startups ordered by (company_name, id), optionally narrowed to
+    company names containing `name`.
+    Pass the `X-Next-Cursor` response header back as `cursor` to fetch the next
+    page; the first page (no `cursor`) also carries `X-Total-Count`, the number
+    of rows matching the filters.
+    """
+    filters = dict(
+        name=name,
+        country=country,
+        funding_stage=funding_stage,
+        funds_raised=funds_raised,
+        trl=trl,
+        num_employees=num_employees,
+    )
+    statement = filter_startups(
+        select(Startup).options(*StartupReadLite.load_options()), **filters
+    )
+    if cursor:
+        statement = after_cursor(statement, cursor)
+    # One extra row tells us whether there is a next page
+    statement = statement.order_by(
+        Startup.company_name.asc().nulls_last(), Startup.id.asc()
+    ).limit(limit + 1)
+    startups = (await session.exec(statement)).all()
+
+    if cursor is None:
+        total = (
+            await session.exec(
+                filter_startups(select(func.count()).select_from(Startup), **filters)
+            )
+        ).one()
+        response.headers["X-Total-Count"] = str(total)
+    if len(startups) > limit:
+        startups = startups[:limit]
+        last = startups[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.company_name, last.id)
+    return startups
+
+
+@router.get("/export")
+async def export_startups(
+    format: ExportFormat = Query(ExportFormat.ndjson),
+    gzip: bool = Query(False),
+    country: Optional[List[str]] = Query(None),
+    funding_stage: Optional[List[FundingStageEnum]] = Query(None),
+    funds_raised: Optional[List[FundsRaisedEnum]] = Query(None),
+    trl: Optional[List[TrlEnum]] = Query(None),
+    num_employees: Optional[List[NumEmployeesEnum]] = Query(None),
+):
+    """
+    Every startup matching the filters, in the `StartupReadLite` shape,
+    streamed row by row as NDJSON or CSV (nested fields as JSON cells).
+    """
+    statement = filter_startups(
+        select(Startup).options(*StartupReadLite.load_options()),
+        country=country,
+        funding_stage=funding_stage,
+        funds_raised=funds_raised,
+        trl=trl,
+        num_employees=num_employees,
+    ).order_by(Startup.id)
+    return export_response(statement, StartupReadLite, "startups", format, gzip)
 
 
 @router.get("/by_id/{startup_id}", response_model=StartupReadLite)
-def get_startup_by_id(startup_id: int, session: Session = Depends(get_session)):
-    db_startup = session.get(Startup, startup_id)
+async def get_startup_by_id(
+    startup_id: int, session: AsyncSession = Depends(get_session)
+):
+    db_startup = await session.get(
+        Startup, startup_id, options=StartupReadLite.load_options()
+    )
     if not db_startup:
         raise HTTPException(status_code=404, detail="Start-up not found")
     return db_startup
 
 
 @router.get("/by_website", response_model=StartupReadLite | None)
-def get_startup_by_website(
-    lookup_url: str = Query(...), session: Session = Depends(get_session)
+async def get_startup_by_website(
+    lookup_url: str = Query(...), session: AsyncSession = Depends(get_session)
 ):
-    maybe_startup = session.exec(
-        select(Startup).where(Startup.company_website == lookup_url)
+    maybe_startup = (
+        await session.exec(
+            select(Startup)
+            .where(Startup.company_website == lookup_url)
+            .options(*StartupReadLite.load_options())
+        )
     ).one_or_none()
     return maybe_startup
 
 
+@router.get("/search", response_model=list[StartupSearchResult])
+async def search_startups(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Full-text search over company name, tech offering, UVP, use cases and TRL
+    explanation (web search syntax: quotes, `or`, `-word`). Matches come from
+    the GIN-indexed `search_vector`; snippets are only built for returned rows.
+    """
+    tsquery = func.websearch_to_tsquery("english", q)
+    rank = func.ts_rank_cd(Startup.search_vector, tsquery)
+    hits = (
+        select(Startup.id, rank.label("rank"))
+        .where(Startup.search_vector.op("@@")(tsquery))
+        .order_by(rank.desc(), Startup.id)
+        .limit(limit)
+        .subquery()
+    )
+    snippet = func.ts_headline(
+        "english",
+        func.concat_ws(
+            " … ", Startup.tech_offering, Startup.uvp, Startup.trl_explanation
+        ),
+        tsquery,
+        SEARCH_HEADLINE_OPTIONS,
+    )
+    rows = (
+        await session.exec(
+            select(Startup, hits.c.rank, snippet)
+            .join(hits, Startup.id == hits.c.id)
+            .options(*StartupReadLite.load_options())
+            .order_by(hits.c.rank.desc(), Startup.id)
+        )
+    ).all()
+    return [
+        StartupSearchResult(
+            startup=StartupReadLite.model_validate(startup), rank=rank, snippet=snippet
+        )
+        for startup, rank, snippet in rows
+    ]
+
+
 @router.put("/{startup_id}", response_model=StartupReadLite)
-def update_startup_by_id(
+async def update_startup_by_id(
     startup_id: int,
     startup_update: StartupUpsert,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
-    db_startup = session.get(Startup, startup_id)
+    update_data = startup_update.model_dump(exclude_unset=True)
+    # Generate embeddings, and drop the ones whose text was cleared. This comes
+    # first so no connection sits idle in a transaction while OpenAI answers.
+    for field, column in EMBEDDED_FIELDS.items():
+        if field in update_data and not update_data[field]:
+            update_data[column] = None
+    update_data.update(await embed_startup_fields(update_data))
+    db_startup = await session.get(Startup, startup_id)
     if not db_startup:
         raise HTTPException(status_code=404, detail="Start-up not found")
-    update_data = startup_update.model_dump(exclude_unset=True)
-    # Generate embeddings
-    if startup_update.tech_offering:
-        update_data["tech_embedding"] = (
-            client.embeddings.create(
-                model="text-embedding-3-small", input=startup_update.tech_offering
-            )
-            .data[0]
-            .embedding
-        )
     db_startup.sqlmodel_update(update_data)
     session.add(db_startup)
-    session.commit()
-    session.refresh(db_startup)
-    return db_startup
+    await session.commit()
+    similarity_engine.update_startup(
+        startup_id,
+        **{col: update_data[col] for col in EMBEDDING_COLUMNS if col in update_data},
+    )
+    session.expunge_all()  # Reload through the read model's loading plan
+    return await session.get(
+        Startup,
+        startup_id,
+        options=StartupReadLite.load_options(),
+    )
 
 
 @router.delete("/", response_model=dict)
-def delete_item(ids: list[int], session: Session = Depends(get_session)):
-    for id in ids:
-        db_startup = session.get(Startup, id)
-        if not db_startup:
-            raise HTTPException(
-                status_code=404, detail="Start-up not found"
-            )  # Cancel delete if anything is missing
-        session.delete(db_startup)
-    session.commit()
+async def delete_item(ids: list[int], session: AsyncSession = Depends(get_session)):
+    # Evaluations and lookup job links go through ON DELETE CASCADE / SET NULL
+    deleted = await session.exec(
+        delete(Startup)
+        .where(any_id(Startup.id, ids))
+        .returning(Startup.id)
+        .execution_options(synchronize_session=False)
+    )
+    if set(ids) - set(deleted.scalars().all()):
+        await session.rollback()  # Cancel delete if anything is missing
+        raise HTTPException(status_code=404, detail="Start-up not found")
+    await session.commit()
+    similarity_engine.remove_startups(ids)
     return {"deleted": True}
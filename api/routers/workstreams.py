@@ -1,61 +1,87 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import delete
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
 
+from api.bulk import any_id, link_startups
 from api.database import get_session
-from api.models.data_models import (
-    Startup,
-    Workstream,
-    WorkstreamStartupEvaluation,
-)
+from api.export import ExportFormat, export_response
+from api.models.data_models import Workstream
 from api.models.read_models import WorkstreamRead, WorkstreamReadLite, WorkstreamUpsert
 
 router = APIRouter(tags=["workstreams"])
 
 
 @router.post("/", response_model=WorkstreamReadLite)
-def create_workstream(
-    workstream_create: WorkstreamUpsert, session: Session = Depends(get_session)
+async def create_workstream(
+    workstream_create: WorkstreamUpsert, session: AsyncSession = Depends(get_session)
 ):
     upsert_dict = workstream_create.model_dump()
     maybe_startup_ids = upsert_dict.pop("startup_ids", [])
     workstream = Workstream(**upsert_dict)
     session.add(workstream)
-    session.flush()  # ensures workstream.id is available
-
-    # Create evaluations for each startup
-    for sid in maybe_startup_ids:
-        startup = session.get(Startup, sid)
-        if not startup:
-            raise HTTPException(status_code=404, detail=f"Startup {sid} not found")
-        evaluation = WorkstreamStartupEvaluation(
-            workstream=workstream,
-            startup=startup,
-        )
-        session.add(evaluation)
-    session.commit()
-    session.refresh(workstream)
-    return workstream
+    await session.flush()  # ensures workstream.id is available
+
+    # Link all startups in one statement
+    missing = await link_startups(session, workstream.id, maybe_startup_ids)
+    if missing:
+        await session.rollback()
+        raise HTTPException(status_code=404, detail=f"Startup {min(missing)} not found")
+    await session.commit()
+    session.expunge_all()  # Reload through the read model's loading plan
+    return await session.get(
+        Workstream,
+        workstream.id,
+        options=WorkstreamReadLite.load_options(),
+    )
 
 
 @router.get("/", response_model=List[WorkstreamReadLite])
-def list_workstreams(session: Session = Depends(get_session)):
-    return session.exec(select(Workstream)).all()
+async def list_workstreams(session: AsyncSession = Depends(get_session)):
+    return (
+        await session.exec(
+            select(Workstream).options(*WorkstreamReadLite.load_options())
+        )
+    ).all()
+
+
+@router.get("/export")
+async def export_workstreams(
+    format: ExportFormat = Query(ExportFormat.ndjson),
+    gzip: bool = Query(False),
+):
+    """
+    Every workstream in the `WorkstreamReadLite` shape, streamed row by row
+    as NDJSON or CSV (evaluations as a JSON cell).
+    """
+    statement = (
+        select(Workstream)
+        .options(*WorkstreamReadLite.load_options())
+        .order_by(Workstream.id)
+    )
+    return export_response(statement, WorkstreamReadLite, "workstreams", format, gzip)
 
 
 @router.get("/{workstream_id}", response_model=WorkstreamRead)
-def get_workstream(workstream_id: int, session: Session = Depends(get_session)):
-    db_ws = session.get(Workstream, workstream_id)
+async def get_workstream(
+    workstream_id: int, session: AsyncSession = Depends(get_session)
+):
+    db_ws = await session.get(
+        Workstream, workstream_id, options=WorkstreamRead.load_options()
+    )
     if not db_ws:
         raise HTTPException(status_code=404, detail="Workstream not found")
     return db_ws
 
 
 @router.put("/{workstream_id}", response_model=WorkstreamRead)
-def update_workstream(
-    workstream_id: int, ws: WorkstreamUpsert, session: Session = Depends(get_session)
+async def update_workstream(
+    workstream_id: int,
+    ws: WorkstreamUpsert,
+    session: AsyncSession = Depends(get_session),
 ):
-    db_ws = session.get(Workstream, workstream_id)
+    db_ws = await session.get(Workstream, workstream_id)
     if not db_ws:
         raise HTTPException(status_code=404, detail="Workstream not found")
 
@@ -63,19 +89,28 @@ def update_workstream(
     db_ws.sqlmodel_update(update_data)
     session.add(db_ws)
 
-    session.commit()
-    session.refresh(db_ws)
-    return db_ws
+    await session.commit()
+    session.expunge_all()  # Reload through the read model's loading plan
+    return await session.get(
+        Workstream,
+        workstream_id,
+        options=WorkstreamRead.load_options(),
+    )
 
 
 @router.delete("/", response_model=dict)
-def delete_workstream(ids: list[int], session: Session = Depends(get_session)):
-    for id in ids:
-        db_ws = session.get(Workstream, id)
-        if not db_ws:
-            raise HTTPException(
-                status_code=404, detail="Workstream not found"
-            )  # Cancel delete if anything is missing
-        session.delete(db_ws)
-    session.commit()
+async def delete_workstream(
+    ids: list[int], session: AsyncSession = Depends(get_session)
+):
+    # Evaluations go with them through ON DELETE CASCADE
+    deleted = await session.exec(
+        delete(Workstream)
+        .where(any_id(Workstream.id, ids))
+        .returning(Workstream.id)
+        .execution_options(synchronize_session=False)
+    )
+    if set(ids) - set(deleted.scalars().all()):
+        await session.rollback()  # Cancel delete if anything is missing
+        raise HTTPException(status_code=404, detail="Workstream not found")
+    await session.commit()
     return {"deleted": True}
@@ -0,0 +1,141 @@
+import math
+import os
+from sqlalchemy import Float, cast, func, literal, not_, union_all
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from api.bulk import any_id
+from api.models.data_models import Startup
+
+# Candidates the HNSW index explores per query (pgvector default: 40). It is
+# raised per transaction when a search needs more rows than this.
+HNSW_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", "40"))
+HNSW_MAX_EF_SEARCH = 1000  # pgvector rejects anything larger
+
+
+async def ensure_ef_search(session: AsyncSession, k: int):
+    """Let HNSW scans in this transaction return `k` rows (at most 1000)."""
+    k = min(k, HNSW_MAX_EF_SEARCH)
+    if k > HNSW_EF_SEARCH:
+        await session.exec(select(func.set_config("hnsw.ef_search", str(k), True)))
+
+
+async def nearest_startup_ids(
+    session: AsyncSession,
+    column,
+    query_vecs: list[list[float]],
+    limit: int,
+    exclude_ids: set[int] = frozenset(),
+) -> list[int]:
+    """
+    Ids of the `limit` startups closest (cosine) to any of `query_vecs` on
+    `column`, ranked by their smallest distance and skipping `exclude_ids`.
+
+    Each query vector gets its own `ORDER BY column <=> qv LIMIT limit` so the
+    HNSW index can serve it (a LEAST() over several distances cannot be
+    indexed). All of them go in one UNION ALL round trip and are merged here.
+    `exclude_ids` are filtered in SQL out of the rows the index yields, so
+    ef_search is raised by their number (up to its cap) to keep enough of them.
+    """
+    if not query_vecs or limit <= 0:
+        return []
+    await ensure_ef_search(session, limit + len(exclude_ids))
+
+    per_query = []
+    for qv in query_vecs:
+        distance = column.cosine_distance(qv)
+        statement = select(Startup.id.label("id"), distance.label("distance"))
+        statement = statement.where(column.is_not(None))
+        if exclude_ids:
+            statement = statement.where(not_(any_id(Startup.id, exclude_ids)))
+        per_query.append(statement.order_by(distance).limit(limit))
+    statement = per_query[0] if len(per_query) == 1 else union_all(*per_query)
+    rows = (await session.exec(statement)).all()
+
+    best: dict[int, float] = {}
+    for startup_id, distance in rows:
+        best[startup_id] = min(best.get(startup_id, math.inf), distance)
+    return sorted(best, key=lambda sid: (best[sid], sid))[:limit]
+
+
+# Reciprocal rank fusion constant: score = sum(weight / (RRF_K + rank))
+RRF_K = 60
+
+
+def vector_ranks(column, query_vecs: list[list[float]], k: int, exclude_ids):
+    """(id, rank) of the top `k` rows per query vector, ranked by least distance."""
+    per_query = []
+    for qv in query_vecs:
+        distance = column.cosine_distance(qv)
+        per_query.append(
+            select(Startup.id.label("id"), distance.label("distance"))
+            .where(column.is_not(None), Startup.id.not_in(exclude_ids))
+            .order_by(distance)
+            .limit(k)
+        )
+    hits = (per_query[0] if len(per_query) == 1 else union_all(*per_query)).subquery()
+    rank = func.row_number().over(order_by=func.min(hits.c.distance))
+    return select(hits.c.id, rank.label("rank")).group_by(hits.c.id)
+
+
+def keyword_ranks(query_text: str, k: int, exclude_ids):
+    """(id, rank) of the top `k` full-text matches for `query_text`."""
+    document = Startup.search_vector
+    tsquery = func.websearch_to_tsquery("english", query_text)
+    score = func.ts_rank_cd(document, tsquery)
+    return (
+        select(
+            Startup.id.label("id"),
+            func.row_number().over(order_by=score.desc()).label("rank"),
+        )
+        .where(document.op("@@")(tsquery), Startup.id.not_in(exclude_ids))
+        .order_by(score.desc())
+        .limit(k)
+    )
+
+
+def hybrid_scores(
+    query_vecs: list[list[float]],
+    query_text: str,
+    limit: int,
+    exclude_ids,
+    tech_weight: float = 1.0,
+    uvp_weight: float = 1.0,
+    keyword_weight: float = 1.0,
+    candidates: int = HNSW_EF_SEARCH,
+):
+    """
+    Subquery of (id, score) for the `limit` best startups, fusing tech
+    similarity, UVP similarity and keyword rank with weighted reciprocal rank
+    fusion. Each signal contributes its top `candidates` rows that are not in
+    `exclude_ids` (a collection or a subquery of ids). Signals with no input
+    or a zero weight are left out; at least one must remain.
+    """
+    signals = []
+    if query_vecs and tech_weight > 0:
+        ranks = vector_ranks(
+            Startup.tech_embedding, query_vecs, candidates, exclude_ids
+        )
+        signals.append((ranks, tech_weight))
+    if query_vecs and uvp_weight > 0:
+        ranks = vector_ranks(Startup.uvp_embedding, query_vecs, candidates, exclude_ids)
+        signals.append((ranks, uvp_weight))
+    if query_text and keyword_weight > 0:
+        ranks = keyword_ranks(query_text, candidates, exclude_ids)
+        signals.append((ranks, keyword_weight))
+    if not signals:
+        raise ValueError("Hybrid search needs at least one weighted signal")
+
+    parts = []
+    for ranks, weight in signals:
+        ranks = ranks.subquery()
+        score = literal(float(weight), Float) / cast(RRF_K + ranks.c.rank, Float)
+        parts.append(select(ranks.c.id, score.label("score")))
+    fused = (parts[0] if len(parts) == 1 else union_all(*parts)).subquery()
+    return (
+        select(fused.c.id, func.sum(fused.c.score).label("score"))
+        .group_by(fused.c.id)
+        .order_by(func.sum(fused.c.score).desc(), fused.c.id)
+        .limit(limit)
+        .subquery()
+    )
@@ -0,0 +1,153 @@
+import os
+from typing import Iterable, Optional
+import numpy as np
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from api.models.data_models import Startup
+
+# "pgvector" searches in SQL, "numpy" scores against in-process matrices
+SIMILARITY_BACKEND = os.getenv("SIMILARITY_BACKEND", "pgvector")
+
+EMBEDDING_DIM = 1536
+EMBEDDING_COLUMNS = ("tech_embedding", "uvp_embedding")
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+class VectorIndex:
+    """
+    Exact cosine search over a contiguous float32 matrix of unit vectors.
+    Rows are pre-normalized so a batch of queries is one matrix multiply.
+    Updates are incremental: rows are appended (with amortized growth),
+    overwritten in place, or removed by moving the last row into the hole.
+    """
+
+    def __init__(self, dim: int = EMBEDDING_DIM, capacity: int = 1024):
+        self.dim = dim
+        self._matrix = np.zeros((capacity, dim), dtype=np.float32)
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._rows: dict[int, int] = {}  # startup id -> row
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, startup_id: int) -> bool:
+        return startup_id in self._rows
+
+    def _reserve(self, size: int):
+        if size <= len(self._ids):
+            return
+        capacity = max(size, 2 * len(self._ids), 1024)
+        matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+        ids = np.zeros(capacity, dtype=np.int64)
+        n = len(self)
+        matrix[:n] = self._matrix[:n]
+        ids[:n] = self._ids[:n]
+        self._matrix, self._ids = matrix, ids
+
+    def upsert_many(self, startup_ids: Iterable[int], vectors):
+        startup_ids = list(startup_ids)
+        if not startup_ids:
+            return
+        vectors = normalize(np.asarray(vectors).reshape(len(startup_ids), self.dim))
+        self._reserve(len(self) + len(startup_ids))
+        for startup_id, vector in zip(startup_ids, vectors):
+            row = self._rows.get(startup_id)
+            if row is None:
+                row = self._rows[startup_id] = len(self._rows)
+                self._ids[row] = startup_id
+            self._matrix[row] = vector
+
+    def upsert(self, startup_id: int, vector):
+        self.upsert_many([startup_id], [vector])
+
+    def remove(self, startup_id: int):
+        row = self._rows.pop(startup_id, None)
+        if row is None:
+            return
+        last = len(self._rows)
+        if row != last:
+            self._matrix[row] = self._matrix[last]
+            self._ids[row] = self._ids[last]
+            self._rows[int(self._ids[row])] = row
+
+    def search(
+        self,
+        query_vecs,
+        limit: int,
+        exclude_ids: Iterable[int] = (),
+    ) -> list[tuple[int, float]]:
+        """
+        (startup id, cosine distance) of the `limit` rows closest to any of
+        `query_vecs`, ranked by their smallest distance like the SQL path.
+        """
+        n = len(self)
+        if n == 0 or limit <= 0 or len(query_vecs) == 0:
+            return []
+        queries = normalize(np.asarray(query_vecs).reshape(-1, self.dim))
+        best = (queries @ self._matrix[:n].T).max(axis=0)
+        for startup_id in exclude_ids:
+            row = self._rows.get(startup_id)
+            if row is not None:
+                best[row] = -np.inf
+        k = min(limit, n)
+        top = np.argpartition(-best, k - 1)[:k]
+        top = top[np.isfinite(best[top])]
+        ids = self._ids[top]
+        order = np.lexsort((ids, -best[top]))
+        return [(int(ids[i]), float(1 - best[top][i])) for i in order]
+
+
+class SimilarityEngine:
+    """
+    One `VectorIndex` per embedding column of `startups`.
+    Each uvicorn worker holds its own copy; writes made through this worker
+    are applied incrementally, others are picked up on the next `load`.
+    """
+
+    def __init__(self):
+        self.indexes = {column: VectorIndex() for column in EMBEDDING_COLUMNS}
+        self.loaded = False
+
+    async def load(self, session: AsyncSession, batch_size: int = 5000):
+        """Build every index from the database, streaming in batches."""
+        for column in EMBEDDING_COLUMNS:
+            index = VectorIndex()
+            db_column = getattr(Startup, column)
+            result = await session.stream(
+                select(Startup.id, db_column).where(db_column.is_not(None))
+            )
+            async for partition in result.partitions(batch_size):
+                index.upsert_many(
+                    [row[0] for row in partition], [row[1] for row in partition]
+                )
+            self.indexes[column] = index
+        self.loaded = True
+
+    def update_startup(self, startup_id: int, **embeddings: Optional[list[float]]):
+        """Apply freshly written embeddings, e.g. `tech_embedding=[...]`."""
+        if not self.loaded:
+            return
+        for column, vector in embeddings.items():
+            if vector is None:
+                self.indexes[column].remove(startup_id)
+            else:
+                self.indexes[column].upsert(startup_id, vector)
+
+    def remove_startups(self, startup_ids: Iterable[int]):
+        if not self.loaded:
+            return
+        for startup_id in startup_ids:
+            for index in self.indexes.values():
+                index.remove(startup_id)
+
+    def search(self, column: str, query_vecs, limit: int, exclude_ids=()):
+        return self.indexes[column].search(query_vecs, limit, exclude_ids)
+
+
+similarity_engine = SimilarityEngine()
@@ -0,0 +1,19 @@
+import json
+from typing import Optional
+
+# Server-sent events: keep proxies from buffering or caching the stream
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+SSE_MEDIA_TYPE = "text/event-stream"
+
+
+def sse_event(data, event: Optional[str] = None) -> str:
+    """One `text/event-stream` frame; `data` is sent as JSON unless a string."""
+    payload = data if isinstance(data, str) else json.dumps(data)
+    lines = [f"event: {event}"] if event else []
+    lines += [f"data: {line}" for line in payload.splitlines() or [""]]
+    return "\n".join(lines) + "\n\n"
+
+
+def sse_comment(comment: str = "ping") -> str:
+    """Ignored by clients; keeps idle connections open."""
+    return f": {comment}\n\n"
@@ -0,0 +1,84 @@
+"""
+Memory and latency of a startup listing with and without the embedding columns.
+
+Seeds synthetic startups (with random 1536-dim embeddings) inside a transaction,
+times `select(Startup)` with the default deferred embeddings against the same
+query with the embeddings undeferred, then rolls everything back.
+
+Run from the root directory:
+`python -m benchmarks.deferred_embeddings --rows 10000`
+"""
+
+import argparse
+import statistics
+import time
+import tracemalloc
+
+import numpy as np
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import undefer_group
+from sqlmodel import Session, select
+
+from api.database import SYNC_DATABASE_URL
+from api.models.data_models import EMBEDDINGS_GROUP, Startup
+
+
+def seed(session: Session, rows: int):
+    rng = np.random.default_rng(0)
+    session.execute(
+        insert(Startup.__table__),
+        [
+            {
+                "company_name": f"Benchmark Startup {i:06d}",
+                "company_website": f"https://bench-{i}.example.com",
+                "tech_offering": "Synthetic technology offering " * 10,
+                "uvp": "Synthetic value proposition " * 10,
+                "tech_embedding": rng.random(1536, dtype=np.float32),
+                "uvp_embedding": rng.random(1536, dtype=np.float32),
+            }
+            for i in range(rows)
+        ],
+    )
+    session.flush()
+
+
+def measure(session: Session, options: list, repeat: int) -> tuple[float, float]:
+    """Median latency (ms) and peak traced memory (MB) of loading every startup."""
+    latencies, peaks = [], []
+    for _ in range(repeat):
+        session.expunge_all()  # No help from the identity map
+        tracemalloc.start()
+        start = time.perf_counter()
+        session.exec(select(Startup).options(*options)).all()
+        latencies.append((time.perf_counter() - start) * 1000)
+        peaks.append(tracemalloc.get_traced_memory()[1] / 2**20)
+        tracemalloc.stop()
+    return statistics.median(latencies), max(peaks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = create_engine(SYNC_DATABASE_URL)
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            with Session(bind=conn) as session:
+                seed(session, args.rows)
+                total = len(session.exec(select(Startup.id)).all())
+                print(f"Listing {total} startups ({args.rows} synthetic)")
+                for label, options in (
+                    ("deferred embeddings", []),
+                    ("undeferred embeddings", [undefer_group(EMBEDDINGS_GROUP)]),
+                ):
+                    latency, peak = measure(session, options, args.repeat)
+                    print(f"{label:>22}: {latency:9.1f} ms  {peak:9.1f} MB peak")
+        finally:
+            trans.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Deterministic local stand-in for the OpenAI endpoints the API uses.
+
+Serves `/v1/responses` (plain and streamed) and `/v1/embeddings` after a
+configurable delay. Answers depend only on the request input: embeddings are
+unit vectors seeded from the text, and every response is the same JSON shape
+carrying the fields of a startup profile and of all suggestion types, so the
+lookup and analyse endpoints validate it. Point the API at it with
+`OPENAI_BASE_URL=http://localhost:8100/v1`.
+
+Run from the root directory:
+`python -m benchmarks.fake_openai --port 8100 --latency-ms 800 --jitter-ms 200`
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+
+import numpy as np
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+from api.similarity import EMBEDDING_DIM
+
+VOCABULARY = (
+    "modular scalable low-carbon autonomous predictive secure compact "
+    "sensor platform membrane battery analytics pilot partner regional "
+    "licensing integration deployment certification supply chain"
+).split()
+STREAM_CHUNK_CHARS = 40
+
+app = FastAPI(title="Fake OpenAI")
+latency = {"base": 0.0, "jitter": 0.0}
+
+
+def seed_of(text: str) -> int:
+    return int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "little")
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + 3) // 4
+
+
+async def delay(share: float = 1.0):
+    await asyncio.sleep(
+        share * (latency["base"] + random.uniform(0, latency["jitter"]))
+    )
+
+
+def fake_embedding(text: str, dims: int) -> list[float]:
+    vector = np.random.default_rng(seed_of(text)).standard_normal(dims)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+def fake_answer(prompt: str) -> str:
+    rng = random.Random(seed_of(prompt))
+
+    def sentence(words: int) -> str:
+        return " ".join(rng.choices(VOCABULARY, k=words)).capitalize() + "."
+
+    return json.dumps(
+        {
+            # Startup lookup (StartupUpsert)
+            "company_name": f"Fake Startup {rng.randrange(10**6):06d}",
+            "year_founded": str(rng.randrange(2000, 2025)),
+            "country": rng.choice(["Singapore", "Germany", "Japan"]),
+            "funding_stage": rng.choice(["Seed", "Series A", "Series B"]),
+            "trl": rng.choice(["TRL 5-7", "TRL 8-9"]),
+            "tech_offering": sentence(30),
+            "uvp": sentence(25),
+            "use_cases": [sentence(5) for _ in range(3)],
+            # Workstream suggestions
+            "use_case": sentence(30),
+            "challenge": sentence(30),
+            "technologies": [sentence(2) for _ in range(4)],
+            "overall_recommendation": sentence(40),
+            # Startup evaluations
+            "competitive_advantage": sentence(40),
+            "risks": sentence(30),
+            "collaboration_potential": sentence(30),
+        }
+    )
+
+
+def response_object(body: dict, text: str) -> dict:
+    prompt = f"{body.get('instructions') or ''}{json.dumps(body.get('input'))}"
+    input_tokens, output_tokens = estimate_tokens(prompt), estimate_tokens(text)
+    return {
+        "id": f"resp_{seed_of(prompt):016x}",
+        "object": "response",
+        "created_at": int(time.time()),
+        "model": body.get("model", "fake"),
+        "status": "completed",
+        "error": None,
+        "incomplete_details": None,
+        "instructions": body.get("instructions"),
+        "metadata": {},
+        "parallel_tool_calls": True,
+        "tool_choice": "auto",
+        "tools": [],
+        "output": [
+            {
+                "type": "message",
+                "id": "msg_fake",
+                "role": "assistant",
+                "status": "completed",
+                "content": [{"type": "output_text", "text": text, "annotations": []}],
+            }
+        ],
+        "usage": {
+            "input_tokens": input_tokens,
+            "input_tokens_details": {"cached_tokens": 0},
+            "output_tokens": output_tokens,
+            "output_tokens_details": {"reasoning_tokens": 0},
+            "total_tokens": input_tokens + output_tokens,
+        },
+    }
+
+
+def stream_events(body: dict, text: str):
+    """`response.created`, text deltas spread over the latency, `completed`."""
+
+    async def events():
+        response = response_object(body, text)
+        chunks = [
+            text[i : i + STREAM_CHUNK_CHARS]
+            for i in range(0, len(text), STREAM_CHUNK_CHARS)
+        ]
+        sequence = 0
+
+        def event(data: dict) -> str:
+            nonlocal sequence
+            sequence += 1
+            data = {**data, "sequence_number": sequence}
+            return f"event: {data['type']}\ndata: {json.dumps(data)}\n\n"
+
+        yield event(
+            {
+                "type": "response.created",
+                "response": {**response, "status": "in_progress", "output": []},
+            }
+        )
+        for chunk in chunks:
+            await delay(1 / len(chunks))
+            yield event(
+                {
+                    "type": "response.output_text.delta",
+                    "item_id": "msg_fake",
+                    "output_index": 0,
+                    "content_index": 0,
+                    "delta": chunk,
+                    "logprobs": [],
+                }
+            )
+        yield event({"type": "response.completed", "response": response})
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.post("/v1/responses")
+async def create_response(request: Request):
+    body = await request.json()
+    text = fake_answer(f"{body.get('instructions')}{json.dumps(body.get('input'))}")
+    if body.get("stream"):
+        return stream_events(body, text)
+    await delay()
+    return response_object(body, text)
+
+
+@app.post("/v1/embeddings")
+async def create_embeddings(request: Request):
+    body = await request.json()
+    texts = body["input"] if isinstance(body["input"], list) else [body["input"]]
+    dims = body.get("dimensions") or EMBEDDING_DIM
+    await delay()
+    tokens = sum(estimate_tokens(str(text)) for text in texts)
+    return {
+        "object": "list",
+        "model": body.get("model", "fake"),
+        "data": [
+            {"object": "embedding", "index": i, "embedding": fake_embedding(t, dims)}
+            for i, t in enumerate(texts)
+        ],
+        "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=800)
+    parser.add_argument("--jitter-ms", type=float, default=200)
+    parser.add_argument("--seed", type=int, default=0, help="of the latency jitter")
+    args = parser.parse_args()
+    latency.update(base=args.latency_ms / 1000, jitter=args.jitter_ms / 1000)
+    random.seed(args.seed)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
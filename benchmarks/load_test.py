@@ -0,0 +1,107 @@
+"""
+Concurrent load against a running API instance.
+
+Fires `--requests` calls at one route with `--concurrency` in flight at a time
+and reports throughput and latency percentiles. With the async database stack,
+throughput keeps climbing past the threadpool size (40 by default) instead of
+flattening out, e.g.:
+
+`python -m benchmarks.load_test --path /startups/by_id/1 --concurrency 200`
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, round(pct / 100 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    method: str,
+    path: str,
+    num_requests: int,
+    concurrency: int,
+    **request_kwargs,
+) -> dict:
+    """
+    Issue `num_requests` calls with at most `concurrency` in flight.
+    A callable request kwarg is called for every request, e.g. to send a fresh
+    payload each time.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async def one_call():
+        nonlocal errors
+        async with semaphore:
+            kwargs = {
+                key: value() if callable(value) else value
+                for key, value in request_kwargs.items()
+            }
+            start = time.perf_counter()
+            try:
+                resp = await client.request(method, path, **kwargs)
+                if resp.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_call() for _ in range(num_requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "method": method,
+        "path": path,
+        "requests": num_requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "throughput_rps": num_requests / elapsed if elapsed else 0.0,
+        "mean_ms": statistics.fmean(latencies) if latencies else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+async def main_async(args):
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.url, limits=limits, timeout=args.timeout
+    ) as client:
+        stats = await run_load(
+            client, args.method, args.path, args.requests, args.concurrency
+        )
+    for key, value in stats.items():
+        print(
+            f"{key:>15}: {value:.1f}"
+            if isinstance(value, float)
+            else f"{key:>15}: {value}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--method", default="GET")
+    parser.add_argument("--path", default="/startups/by_id/1")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--timeout", type=float, default=60)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
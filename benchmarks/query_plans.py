@@ -0,0 +1,221 @@
+"""
+Query-plan regression check for the hot queries.
+
+Runs the API code behind the vector search of
+`suggest_startups_from_technologies` (excluding the startups of the busiest
+workstream, as the route does), `get_startup_by_website`,
+`list_evaluations` by startup and `get_workstream` (the workstream /
+evaluation / startup loads) against the configured database, captures the
+SQL each emits and runs it again under `EXPLAIN (ANALYZE, BUFFERS)`. Exits
+with status 1 when a plan contains a sequential scan, misses its expected
+index or touches more shared buffers than its budget.
+
+Plans are explained with the planner's default settings. On tables small
+enough for a Seq Scan to be cheaper, `--disable-seqscan` shows whether an
+index could serve the statement at all. Seed the database first
+(`benchmarks.seed`); all statements run in a transaction that is rolled back.
+
+Run from the root directory:
+`python -m benchmarks.query_plans`
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from typing import Awaitable, Callable, Optional
+
+import numpy as np
+from pgvector.asyncpg import register_vector
+from sqlalchemy import event, func
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from api.database import DATABASE_URL
+from api.models.data_models import Startup, WorkstreamStartupEvaluation
+from api.routers.evaluations import list_evaluations
+from api.routers.startups import get_startup_by_website
+from api.routers.workstreams import get_workstream
+from api.search import nearest_startup_ids
+from api.similarity import EMBEDDING_DIM
+
+
+class Check:
+    """API code whose statements must use indexes within a buffer budget."""
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[AsyncSession, dict], Awaitable],
+        buffer_budget: int,
+        expect_index: Optional[str] = None,
+    ):
+        self.name = name
+        self.run = run
+        self.buffer_budget = buffer_budget  # shared blocks hit + read, all statements
+        self.expect_index = expect_index
+
+
+CHECKS = [
+    Check(
+        "nearest_startups",
+        lambda s, d: nearest_startup_ids(
+            s, Startup.tech_embedding, [d["vector"]], 5, d["exclude_ids"]
+        ),
+        buffer_budget=5000,
+        expect_index="ix_startups_tech_embedding_hnsw",
+    ),
+    Check(
+        "startup_by_website",
+        lambda s, d: get_startup_by_website(d["website"], s),
+        buffer_budget=200,
+    ),
+    Check(
+        "evaluations_by_startup",
+        lambda s, d: list_evaluations(None, d["startup_id"], s),
+        buffer_budget=50,
+        expect_index="ix_workstream_startup_evaluations_startup_id",
+    ),
+    Check(
+        "workstream_read",
+        lambda s, d: get_workstream(d["workstream_id"], s),
+        buffer_budget=2000,
+    ),
+]
+
+
+def plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+async def sample(session: AsyncSession) -> dict:
+    """The busiest workstream, its startups and a random query vector."""
+    counts = await session.exec(
+        select(WorkstreamStartupEvaluation.workstream_id, func.count())
+        .group_by(WorkstreamStartupEvaluation.workstream_id)
+        .order_by(func.count().desc())
+        .limit(1)
+    )
+    busiest = counts.first()
+    if not busiest:
+        raise SystemExit("No evaluations to check: run `python -m benchmarks.seed`")
+    workstream_id = busiest[0]
+    startups = (
+        await session.exec(
+            select(Startup.id, Startup.company_website)
+            .join(WorkstreamStartupEvaluation)
+            .where(WorkstreamStartupEvaluation.workstream_id == workstream_id)
+        )
+    ).all()
+    vector = np.random.default_rng(0).standard_normal(EMBEDDING_DIM)
+    return {
+        "workstream_id": workstream_id,
+        "startup_id": startups[0].id,
+        "website": startups[0].company_website,
+        "exclude_ids": {startup.id for startup in startups},
+        "vector": (vector / np.linalg.norm(vector)).tolist(),
+    }
+
+
+async def explain(session: AsyncSession, statement: str, parameters) -> dict:
+    conn = await session.connection()
+    result = await conn.exec_driver_sql(
+        f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters
+    )
+    plan = result.scalar_one()
+    return (json.loads(plan) if isinstance(plan, str) else plan)[0]
+
+
+async def run_checks(args) -> list[str]:
+    engine = create_async_engine(DATABASE_URL)
+    captured: Optional[list] = None
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def connect(dbapi_connection, connection_record):
+        dbapi_connection.run_async(register_vector)
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if captured is not None:
+            captured.append((statement, parameters))
+
+    failures = []
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            session = AsyncSession(bind=conn)
+            data = await sample(session)
+            if args.disable_seqscan:
+                await session.exec(
+                    select(func.set_config("enable_seqscan", "off", True))
+                )
+            for check in CHECKS:
+                if args.only and check.name not in args.only:
+                    continue
+                session.expunge_all()  # Every check loads from the database
+                captured = []
+                await check.run(session, data)
+                statements, captured = captured, None
+
+                buffers, indexes, problems = 0, set(), []
+                for statement, parameters in statements:
+                    result = await explain(session, statement, parameters)
+                    plan = result["Plan"]
+                    buffers += plan.get("Shared Hit Blocks", 0)
+                    buffers += plan.get("Shared Read Blocks", 0)
+                    for node in plan_nodes(plan):
+                        if "Index Name" in node:
+                            indexes.add(node["Index Name"])
+                        if node["Node Type"] == "Seq Scan":
+                            problems.append(f"Seq Scan on {node['Relation Name']}")
+                    if args.verbose:
+                        print(f"--- {check.name}\n{statement}")
+                        print(json.dumps(plan, indent=2))
+                budget = int(check.buffer_budget * args.budget_scale)
+                if buffers > budget:
+                    problems.append(f"{buffers} buffers > budget {budget}")
+                if check.expect_index and check.expect_index not in indexes:
+                    problems.append(f"{check.expect_index} not used")
+
+                status = "FAIL" if problems else "ok"
+                print(
+                    f"{check.name:>24}: {status:4}  {len(statements)} statements"
+                    f"  {buffers:6} buffers  indexes: {', '.join(sorted(indexes))}"
+                )
+                for problem in problems:
+                    print(f"{'':>26}{problem}")
+                    failures.append(f"{check.name}: {problem}")
+        finally:
+            await trans.rollback()
+            await engine.dispose()
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--only", nargs="+", choices=[c.name for c in CHECKS], help="checks to run"
+    )
+    parser.add_argument(
+        "--disable-seqscan",
+        action="store_true",
+        help="explain with sequential scans disabled, to test small tables",
+    )
+    parser.add_argument(
+        "--budget-scale", type=float, default=1.0, help="multiply buffer budgets"
+    )
+    parser.add_argument("--verbose", action="store_true", help="print SQL and plans")
+    args = parser.parse_args()
+
+    failures = asyncio.run(run_checks(args))
+    if failures:
+        print(f"{len(failures)} plan regression(s)")
+        sys.exit(1)
+    print("All plans use their indexes within budget")
+
+
+if __name__ == "__main__":
+    main()
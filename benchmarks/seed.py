@@ -0,0 +1,198 @@
+"""
+Seed the database with synthetic startups, workstreams and evaluations.
+
+Startups get plausible field values, a vocabulary shared with the workstreams
+(so full-text and similarity search find matches) and random unit-length
+1536-dim embeddings. Rows from a previous run, and the lookup jobs queued by
+`benchmarks.suite`, are removed first; pass `--clear` to only remove them.
+Restart the API afterwards when it uses the NumPy similarity backend.
+
+Run from the root directory:
+`python -m benchmarks.seed --scale 10k`
+"""
+
+import argparse
+import time
+
+import numpy as np
+from sqlalchemy import create_engine, delete, insert, select
+from sqlmodel import Session
+
+from api.database import SYNC_DATABASE_URL
+from api.models.data_models import (
+    FundingStageEnum,
+    FundsRaisedEnum,
+    LookupJob,
+    NumEmployeesEnum,
+    Startup,
+    TrlEnum,
+    Workstream,
+    WorkstreamStartupEvaluation,
+)
+from api.similarity import EMBEDDING_DIM
+
+SCALES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+WEBSITE_PATTERN = "https://bench-seed-%.example.com"
+WORKSTREAM_TITLE = "Benchmark workstream"
+
+COUNTRIES = ["Singapore", "Germany", "United States", "Japan", "France", "India"]
+VOCABULARY = (
+    "battery hydrogen solar carbon capture robotics drone lidar vision "
+    "analytics platform sensor biotech enzyme recycling water grid storage "
+    "logistics maritime fintech payments security identity quantum photonics "
+    "semiconductor agritech vertical farming insurance healthcare diagnostics "
+    "wearable materials coating membrane catalyst edge cloud inference"
+).split()
+
+
+def words(rng: np.random.Generator, count: int) -> str:
+    return " ".join(rng.choice(VOCABULARY, count))
+
+
+def pick(rng: np.random.Generator, options: list):
+    return options[rng.integers(len(options))]
+
+
+def unit_vectors(rng: np.random.Generator, rows: int) -> np.ndarray:
+    vectors = rng.standard_normal((rows, EMBEDDING_DIM), dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def lookup_url(key: str) -> str:
+    """Website for the lookup scenario of `benchmarks.suite`, removed by `clear`."""
+    return WEBSITE_PATTERN.replace("%", f"lookup-{key}")
+
+
+def startup_rows(rng: np.random.Generator, start: int, rows: int) -> list[dict]:
+    tech = unit_vectors(rng, rows)
+    uvp = unit_vectors(rng, rows)
+    return [
+        {
+            "company_name": f"Seeded Startup {i:06d} {words(rng, 1).title()}",
+            "company_website": WEBSITE_PATTERN.replace("%", str(i)),
+            "year_founded": str(rng.integers(2000, 2025)),
+            "country": pick(rng, COUNTRIES),
+            "num_employees": pick(rng, list(NumEmployeesEnum)),
+            "funding_stage": pick(rng, list(FundingStageEnum)),
+            "funds_raised": pick(rng, list(FundsRaisedEnum)),
+            "trl": pick(rng, list(TrlEnum)),
+            "investors": [f"Investor {n}" for n in rng.integers(0, 500, 3)],
+            "tech_offering": f"Develops {words(rng, 30)}.",
+            "uvp": f"Helps customers with {words(rng, 25)}.",
+            "trl_explanation": f"Piloted in {words(rng, 12)}.",
+            "use_cases": [words(rng, 4) for _ in range(3)],
+            "tech_embedding": tech[n],
+            "uvp_embedding": uvp[n],
+        }
+        for n, i in enumerate(range(start, start + rows))
+    ]
+
+
+def clear(session: Session):
+    # Evaluations go with them through ON DELETE CASCADE
+    session.execute(
+        delete(Workstream).where(Workstream.title.like(f"{WORKSTREAM_TITLE} %"))
+    )
+    session.execute(
+        delete(Startup).where(Startup.company_website.like(WEBSITE_PATTERN))
+    )
+    session.execute(
+        delete(LookupJob).where(LookupJob.startup_url.like(WEBSITE_PATTERN))
+    )
+    session.commit()
+
+
+def seed(
+    session: Session,
+    rng: np.random.Generator,
+    startups: int,
+    workstreams: int,
+    evaluations: int,
+    batch_size: int,
+):
+    for start in range(0, startups, batch_size):
+        rows = min(batch_size, startups - start)
+        session.execute(insert(Startup.__table__), startup_rows(rng, start, rows))
+        session.commit()
+        print(f"  startups: {start + rows}/{startups}")
+    startup_ids = np.array(
+        session.execute(
+            select(Startup.id).where(Startup.company_website.like(WEBSITE_PATTERN))
+        )
+        .scalars()
+        .all()
+    )
+
+    workstream_ids = (
+        session.execute(
+            insert(Workstream.__table__).returning(Workstream.id),
+            [
+                {
+                    "title": f"{WORKSTREAM_TITLE} {i:05d}",
+                    "use_case": f"Looking for {words(rng, 20)}.",
+                    "challenge": f"Today {words(rng, 20)} is hard.",
+                    "technologies": [words(rng, 2) for _ in range(4)],
+                }
+                for i in range(workstreams)
+            ],
+        )
+        .scalars()
+        .all()
+    )
+    per_workstream = min(evaluations, len(startup_ids))
+    eval_rows = [
+        {
+            "workstream_id": ws_id,
+            "startup_id": int(startup_id),
+            # Half of them filled in, like a workstream under review
+            "competitive_advantage": words(rng, 20) if n % 2 else None,
+            "risks": words(rng, 15) if n % 2 else None,
+            "collaboration_potential": words(rng, 15) if n % 2 else None,
+        }
+        for ws_id in workstream_ids
+        for n, startup_id in enumerate(
+            rng.choice(startup_ids, per_workstream, replace=False)
+        )
+    ]
+    for start in range(0, len(eval_rows), batch_size):
+        session.execute(
+            insert(WorkstreamStartupEvaluation.__table__),
+            eval_rows[start : start + batch_size],
+        )
+    session.commit()
+    print(f"  workstreams: {workstreams}, evaluations: {len(eval_rows)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", choices=SCALES, default="10k")
+    parser.add_argument("--workstreams", type=int, help="default: startups / 100")
+    parser.add_argument("--evaluations", type=int, default=20, help="per workstream")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--clear", action="store_true", help="only remove seeded rows")
+    args = parser.parse_args()
+
+    startups = SCALES[args.scale]
+    workstreams = args.workstreams or max(1, startups // 100)
+    engine = create_engine(SYNC_DATABASE_URL)
+    with Session(engine) as session:
+        clear(session)
+        if args.clear:
+            print("Removed seeded rows")
+            return
+        print(f"Seeding {startups} startups")
+        start = time.perf_counter()
+        seed(
+            session,
+            np.random.default_rng(args.seed),
+            startups,
+            workstreams,
+            args.evaluations,
+            args.batch_size,
+        )
+        print(f"Done in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
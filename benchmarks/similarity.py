@@ -0,0 +1,107 @@
+"""
+In-process NumPy similarity engine against the pgvector (HNSW) SQL path.
+
+Generates random 1536-dim embeddings, scores batches of query vectors with
+`VectorIndex.search` and, with `--sql`, with `api.search.nearest_startup_ids`
+on the same rows seeded inside a rolled-back transaction.
+
+Run from the root directory:
+`python -m benchmarks.similarity --rows 10000 --queries 5 --sql`
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import numpy as np
+from pgvector.asyncpg import register_vector
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from api.database import DATABASE_URL
+from api.models.data_models import Startup
+from api.search import nearest_startup_ids
+from api.similarity import EMBEDDING_DIM, VectorIndex
+
+
+def report(label: str, latencies: list[float]):
+    latencies = sorted(latencies)
+    p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+    print(
+        f"{label:>8}: median {statistics.median(latencies) * 1000:9.1f} us"
+        f"  p95 {p95 * 1000:9.1f} us"
+    )
+
+
+def bench_numpy(vectors, queries, limit: int):
+    start = time.perf_counter()
+    index = VectorIndex(capacity=len(vectors))
+    index.upsert_many(range(1, len(vectors) + 1), vectors)
+    print(f"   build: {(time.perf_counter() - start) * 1000:9.1f} ms")
+    latencies = []
+    for q in queries:
+        start = time.perf_counter()
+        index.search(q, limit)
+        latencies.append((time.perf_counter() - start) * 1000)
+    report("numpy", latencies)
+
+
+async def bench_sql(vectors, queries, limit: int):
+    engine = create_async_engine(DATABASE_URL)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def connect(dbapi_connection, connection_record):
+        dbapi_connection.run_async(register_vector)
+
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            session = AsyncSession(bind=conn)
+            for start in range(0, len(vectors), 1000):
+                await session.execute(
+                    insert(Startup.__table__),
+                    [
+                        {
+                            "company_name": f"Similarity Benchmark {start + i}",
+                            "tech_embedding": vector,
+                        }
+                        for i, vector in enumerate(vectors[start : start + 1000])
+                    ],
+                )
+            latencies = []
+            for q in queries:
+                begin = time.perf_counter()
+                await nearest_startup_ids(
+                    session, Startup.tech_embedding, list(q), limit
+                )
+                latencies.append((time.perf_counter() - begin) * 1000)
+            report("pgvector", latencies)
+        finally:
+            await trans.rollback()
+            await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--queries", type=int, default=5, help="vectors per search")
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=50, help="searches to time")
+    parser.add_argument("--sql", action="store_true", help="also time pgvector")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((args.rows, EMBEDDING_DIM), dtype=np.float32)
+    queries = rng.standard_normal(
+        (args.repeat, args.queries, EMBEDDING_DIM), dtype=np.float32
+    )
+    print(f"{args.rows} rows, {args.queries} query vectors, top {args.limit}")
+    bench_numpy(vectors, queries, args.limit)
+    if args.sql:
+        asyncio.run(bench_sql(vectors, queries, args.limit))
+
+
+if __name__ == "__main__":
+    main()
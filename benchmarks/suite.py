@@ -0,0 +1,246 @@
+"""
+Load every router of a running API instance and write the results as JSON.
+
+Picks ids from the data already in the database (seed it with
+`benchmarks.seed`), then runs each scenario through `run_load` one after the
+other and writes throughput and p50/p95/p99 latencies per scenario. Run the
+API against `benchmarks.fake_openai` so the lookup and analyse scenarios
+measure the API rather than OpenAI. With `--baseline`, p95 changes against
+an earlier results file are printed.
+
+Run from the root directory:
+`python -m benchmarks.suite --requests 500 --concurrency 50 --output bench.json`
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import subprocess
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+
+import httpx
+
+from benchmarks.load_test import run_load
+from benchmarks.seed import WORKSTREAM_TITLE, lookup_url
+
+ROUTERS = ("startups", "workstreams", "evaluations", "lookup", "analyse")
+
+
+async def sample(client: httpx.AsyncClient) -> dict:
+    """Ids and payloads the scenarios use, from the API itself."""
+    response = await client.get("/startups/", params={"limit": 50})
+    response.raise_for_status()
+    startups = response.json()
+    workstreams = (await client.get("/workstreams/")).json()
+    if not startups or not workstreams:
+        raise SystemExit("No data to benchmark: run `python -m benchmarks.seed`")
+    # Prefer a seeded workstream with evaluations
+    workstreams.sort(
+        key=lambda w: (
+            not w["title"].startswith(WORKSTREAM_TITLE),
+            -len(w["evaluations"]),
+        )
+    )
+    workstream = (await client.get(f"/workstreams/{workstreams[0]['id']}")).json()
+    evaluated = [e["startup"] for e in workstream["evaluations"]] or startups[:1]
+    return {
+        "total_startups": int(response.headers.get("X-Total-Count", 0)),
+        "startup": startups[0],
+        "startups": startups,
+        "workstream": workstream,
+        "evaluated": evaluated[0],
+        "technologies": workstream.get("technologies") or ["battery storage"],
+    }
+
+
+def scenarios(data: dict) -> list[tuple[str, str, str, dict]]:
+    """(name, method, path, request kwargs) for each router."""
+    startup, workstream = data["startup"], data["workstream"]
+    ws_id, evaluated = workstream["id"], data["evaluated"]
+    # A new website per job: repeating one would only measure the failures
+    # on the company_website unique key
+    run = uuid.uuid4().hex[:8]
+    lookup_urls = (lookup_url(f"{run}-{n}") for n in itertools.count())
+    unlinked = [s["id"] for s in data["startups"][-5:]]
+    websites = [s["company_website"] for s in data["startups"] if s["company_website"]]
+    query = " ".join(data["technologies"][0].split()[:2])
+    use_case = workstream["use_case"] or "Batteries for grid storage"
+    suggest = {"workstream_id": ws_id, "limit": 10}
+    return [
+        ("startups.list", "GET", "/startups/", {"params": {"limit": 25}}),
+        (
+            "startups.list_filtered",
+            "GET",
+            "/startups/",
+            {"params": {"limit": 25, "country": startup["country"]}},
+        ),
+        ("startups.by_id", "GET", f"/startups/by_id/{startup['id']}", {}),
+        (
+            "startups.by_website",
+            "GET",
+            "/startups/by_website",
+            {"params": {"lookup_url": startup["company_website"]}},
+        ),
+        ("startups.search", "GET", "/startups/search", {"params": {"q": query}}),
+        ("workstreams.list", "GET", "/workstreams/", {}),
+        ("workstreams.get", "GET", f"/workstreams/{ws_id}", {}),
+        (
+            "workstreams.update",
+            "PUT",
+            f"/workstreams/{ws_id}",
+            {"json": {"title": workstream["title"]}},
+        ),
+        (
+            "evaluations.list",
+            "GET",
+            "/evaluations/",
+            {"params": {"workstream_id": ws_id}},
+        ),
+        (
+            "evaluations.upsert",
+            "PUT",
+            f"/evaluations/{ws_id}/{evaluated['id']}",
+            {"json": {"risks": "Benchmark risk"}},
+        ),
+        # Links that already exist are skipped, so this stays idempotent
+        ("evaluations.bulk_link", "POST", f"/evaluations/{ws_id}", {"json": unlinked}),
+        ("lookup.check_urls", "POST", "/lookup/check_urls", {"json": websites}),
+        (
+            "analyse.from_use_case",
+            "GET",
+            "/analyse/suggest/from_use_case",
+            {"params": {"use_case": use_case, "refresh": True}},
+        ),
+        (
+            "analyse.from_use_case_cached",
+            "GET",
+            "/analyse/suggest/from_use_case",
+            {"params": {"use_case": use_case}},
+        ),
+        (
+            "analyse.from_use_case_stream",
+            "GET",
+            "/analyse/suggest/from_use_case/stream",
+            {"params": {"use_case": use_case, "refresh": True}},
+        ),
+        (
+            "analyse.startups_from_technologies",
+            "POST",
+            "/analyse/suggest/startups/from_technologies",
+            {"params": suggest, "json": data["technologies"]},
+        ),
+        (
+            "analyse.startups_hybrid",
+            "POST",
+            "/analyse/suggest/startups/hybrid",
+            {"params": suggest, "json": data["technologies"]},
+        ),
+        (
+            "analyse.startup_eval",
+            "POST",
+            "/analyse/suggest/startup_eval/from_workstream",
+            {
+                "params": {"company_name": evaluated["company_name"], "refresh": True},
+                "json": workstream,
+            },
+        ),
+        (
+            "analyse.conclusion",
+            "POST",
+            "/analyse/suggest/conclusion/from_workstream",
+            {"params": {"refresh": True}, "json": workstream},
+        ),
+        # Last: the queued lookups keep calling OpenAI in the background after
+        # this scenario, which would skew any later one. The jobs and their
+        # startups are removed by `python -m benchmarks.seed --clear`
+        (
+            "lookup.enqueue_job",
+            "POST",
+            "/lookup/jobs",
+            {"params": lambda: {"startup_url": next(lookup_urls)}},
+        ),
+    ]
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: list[dict], baseline_path: str):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {r["name"]: r for r in json.load(f)["results"]}
+    print(f"\n{'p95 vs baseline':>36}")
+    for result in results:
+        before = baseline.get(result["name"])
+        if not before or not before["p95_ms"]:
+            continue
+        change = (result["p95_ms"] / before["p95_ms"] - 1) * 100
+        print(
+            f"{result['name']:>36}: {before['p95_ms']:9.1f} -> "
+            f"{result['p95_ms']:9.1f} ms ({change:+.0f}%)"
+        )
+
+
+async def main_async(args):
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.url, limits=limits, timeout=args.timeout
+    ) as client:
+        data = await sample(client)
+        results = []
+        for name, method, path, kwargs in scenarios(data):
+            if name.split(".")[0] not in args.routers:
+                continue
+            stats = await run_load(
+                client, method, path, args.requests, args.concurrency, **kwargs
+            )
+            results.append({"name": name, **stats})
+            print(
+                f"{name:>36}: {stats['throughput_rps']:8.1f} req/s"
+                f"  p50 {stats['p50_ms']:8.1f}  p95 {stats['p95_ms']:8.1f}"
+                f"  p99 {stats['p99_ms']:8.1f} ms  errors {stats['errors']}"
+            )
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "url": args.url,
+            "startups": data["total_startups"],
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--requests", type=int, default=500, help="per scenario")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--routers", nargs="+", choices=ROUTERS, default=list(ROUTERS))
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="earlier results file to compare with")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,74 +1,315 @@
+"""
+Bulk import of startups from a JSON array or NDJSON file.
+
+Records are stream-parsed and validated in batches (`StartupUpsert`, which
+covers `Founders` / `Competitors`), loaded with COPY into a staging table and
+upserted into `startups` on `company_website`. Embeddings that are missing, or
+whose text changed, are then generated in batched concurrent calls.
+
+Run from the root directory:
+`python -m db.init path/to/startups.json [--batch-size 5000] [--no-embed]`
+"""
+
+import argparse
+import asyncio
+import csv
+import io
 import json
+import os
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+
 import psycopg2
 from dotenv import load_dotenv
-import os
+from pydantic import ValidationError
+from sqlalchemy import update
+from sqlmodel import select
 
-# import your models
-from api.models import data_models  # adjust import path
+from api.database import async_session, engine
+from api.embeddings import EMBEDDED_FIELDS, embed_texts
+from api.models.data_models import Startup, StartupUpsert
 
 # load .env
 load_dotenv()
 
-conn = psycopg2.connect(
-    dbname=os.getenv("POSTGRES_DB"),
-    user=os.getenv("POSTGRES_USER"),
-    password=os.getenv("POSTGRES_PASSWORD"),
-    host=os.getenv("POSTGRES_HOST", "localhost"),
-    port=os.getenv("POSTGRES_PORT", "5432"),
-)
-cur = conn.cursor()
-
-with open("db\startups.json", "r", encoding="utf-8") as f:
-    startups = json.load(f)
-
-for s in startups:
-    # ✅ Validate founders + competitors before inserting
-    founders = None
-    if s.get("founders"):
-        founders = data_models.Founders.model_validate(s["founders"]).model_dump()
-
-    competitors = None
-    if s.get("competitors"):
-        print(s["competitors"])
-        competitors = data_models.Competitors.model_validate(
-            s["competitors"]
-        ).model_dump()
-
-    cur.execute(
-        """
-        INSERT INTO startups (
-            company_name, company_website, year_founded, country, num_employees,
-            founders, competitors, funding_stage, funds_raised,
-            ref_funding, investors, tech_offering, ref_tech,
-            uvp, ref_uvp, trl, trl_explanation, use_cases
-        ) VALUES (%s, %s, %s, %s, %s,
-                  %s, %s, %s, %s,
-                  %s, %s, %s, %s,
-                  %s, %s, %s, %s, %s)
+IMPORT_COLUMNS = list(StartupUpsert.model_fields)
+UPDATE_COLUMNS = [c for c in IMPORT_COLUMNS if c != "company_website"]
+
+JSON_CHUNK_SIZE = 1 << 20
+NULL = r"\N"
+MAX_PRUNE_ROUNDS = 5
+
+
+def connect():
+    return psycopg2.connect(
+        dbname=os.getenv("POSTGRES_DB"),
+        user=os.getenv("POSTGRES_USER"),
+        password=os.getenv("POSTGRES_PASSWORD"),
+        host=os.getenv("POSTGRES_HOST", "localhost"),
+        port=os.getenv("POSTGRES_PORT", "5432"),
+    )
+
+
+# -------------------- Parsing --------------------
+def iter_json_array(f) -> Iterator[dict]:
+    """Yield the elements of a top-level JSON array without loading it all."""
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = "", 0, False
+    started = False
+    while True:
+        # Skip whitespace and separators between elements
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,[]":
+            if buffer[pos] == "[":
+                started = True
+            pos += 1
+        if pos == len(buffer):
+            if eof:
+                return
+            buffer, pos = f.read(JSON_CHUNK_SIZE), 0
+            eof = not buffer
+            continue
+        if not started:
+            raise ValueError("Expected a JSON array of startups")
+        try:
+            record, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # Element cut off at the end of the chunk: read more and retry
+            chunk = f.read(JSON_CHUNK_SIZE)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        yield record
+        pos = end
+
+
+def iter_records(path: str) -> Iterator[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        first = ""
+        while not first.strip():
+            first = f.read(1)
+            if not first:
+                return
+        f.seek(0)
+        if first == "[":
+            yield from iter_json_array(f)
+        else:  # NDJSON
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def batched(iterable: Iterable, n: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, n)):
+        yield batch
+
+
+# -------------------- Validation --------------------
+def drop_path(record: dict, loc: tuple) -> bool:
+    """Remove the value at `loc` from the nested record; False if not found."""
+    container = record
+    try:
+        for key in loc[:-1]:
+            container = container[key]
+        if isinstance(container, list):
+            container.pop(loc[-1])
+        else:
+            del container[loc[-1]]
+    except (KeyError, IndexError, TypeError):
+        return False
+    return True
+
+
+def validate_record(record: dict) -> Optional[StartupUpsert]:
+    """
+    Validate, dropping invalid fields rather than the whole record. Returns
+    None when the record is still invalid after MAX_PRUNE_ROUNDS.
+    """
+    for _ in range(MAX_PRUNE_ROUNDS):
+        try:
+            return StartupUpsert.model_validate(record)
+        except ValidationError as e:
+            # A missing required field invalidates the object that holds it
+            locs = {
+                err["loc"][:-1] if err["type"] == "missing" else err["loc"]
+                for err in e.errors()
+            }
+        # Deepest paths and highest list indices first, so the remaining
+        # paths stay valid while deleting
+        pruned = False
+        for loc in sorted(
+            locs, key=lambda loc: [(isinstance(k, str), k) for k in loc], reverse=True
+        ):
+            if loc and (drop_path(record, loc) or drop_path(record, loc[:1])):
+                pruned = True
+        if not pruned:
+            return None
+    return None
+
+
+def to_copy_rows(records: list[dict], first_seq: int) -> tuple[list[list], int]:
+    """CSV rows for the staging table, and how many records were skipped."""
+    rows, skipped = [], 0
+    for seq, record in enumerate(records, start=first_seq):
+        if not isinstance(record, dict) or not record.get("company_website"):
+            skipped += 1  # The upsert key is required
+            continue
+        startup = validate_record(record)
+        if startup is None:
+            skipped += 1
+            continue
+        data = startup.model_dump(mode="json")
+        row = [seq]
+        for column in IMPORT_COLUMNS:
+            value = data.get(column)
+            if value is None:
+                row.append(NULL)
+            elif isinstance(value, (dict, list)):
+                row.append(json.dumps(value))
+            else:
+                row.append(value)
+        rows.append(row)
+    return rows, skipped
+
+
+# -------------------- Loading --------------------
+def create_staging(cur):
+    cur.execute(f"""
+        CREATE TEMP TABLE startups_staging AS
+        SELECT 0::BIGINT AS seq, {", ".join(IMPORT_COLUMNS)}
+        FROM startups WITH NO DATA
+        """)
+
+
+def copy_rows(cur, rows: list[list]):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    cur.copy_expert(
+        f"""
+        COPY startups_staging (seq, {", ".join(IMPORT_COLUMNS)})
+        FROM STDIN WITH (FORMAT csv, NULL '{NULL}')
         """,
-        (
-            s.get("company_name"),
-            s.get("company_website"),
-            s.get("year_founded"),
-            s.get("country"),
-            s.get("num_employees"),
-            founders,
-            competitors,
-            s.get("funding_stage"),
-            s.get("funds_raised"),
-            s.get("ref_funding"),
-            s.get("investors"),
-            s.get("tech_offering"),
-            s.get("ref_tech"),
-            s.get("uvp"),
-            s.get("ref_uvp"),
-            s.get("trl"),
-            s.get("trl_explanation"),
-            s.get("use_cases"),
-        ),
+        buffer,
     )
 
-conn.commit()
-cur.close()
-conn.close()
-print("✅ Insert complete with founders + competitors")
+
+def upsert_staging(cur) -> tuple[int, int]:
+    """Merge staging into startups (last record per website wins)."""
+    columns = ", ".join(IMPORT_COLUMNS)
+    # Embeddings are dropped when the text they were built from changes
+    assignments = [f"{c} = EXCLUDED.{c}" for c in UPDATE_COLUMNS] + [
+        f"{embedding} = CASE WHEN startups.{source} IS DISTINCT FROM "
+        f"EXCLUDED.{source} THEN NULL ELSE startups.{embedding} END"
+        for source, embedding in EMBEDDED_FIELDS.items()
+    ]
+    cur.execute(f"""
+        INSERT INTO startups ({columns})
+        SELECT DISTINCT ON (company_website) {columns}
+        FROM startups_staging
+        ORDER BY company_website, seq DESC
+        ON CONFLICT (company_website) DO UPDATE SET {", ".join(assignments)}
+        RETURNING (xmax = 0) AS inserted
+        """)
+    results = cur.fetchall()
+    inserted = sum(1 for (was_inserted,) in results if was_inserted)
+    cur.execute("TRUNCATE startups_staging")
+    return inserted, len(results) - inserted
+
+
+def load(path: str, batch_size: int):
+    totals = {"read": 0, "skipped": 0, "inserted": 0, "updated": 0}
+    conn = connect()
+    try:
+        with conn.cursor() as cur:
+            create_staging(cur)
+            for records in batched(iter_records(path), batch_size):
+                rows, skipped = to_copy_rows(records, totals["read"])
+                totals["read"] += len(records)
+                totals["skipped"] += skipped
+                if rows:
+                    copy_rows(cur, rows)
+                    inserted, updated = upsert_staging(cur)
+                    totals["inserted"] += inserted
+                    totals["updated"] += updated
+                conn.commit()
+                print(
+                    f"{totals['read']} read, {totals['inserted']} inserted, "
+                    f"{totals['updated']} updated, {totals['skipped']} skipped"
+                )
+    finally:
+        conn.close()
+    return totals
+
+
+# -------------------- Embeddings --------------------
+async def embed_rows(column: str, rows: list[tuple[int, str]]):
+    vectors = await embed_texts([text for _, text in rows])
+    async with async_session() as session:
+        # ORM bulk UPDATE by primary key: one executemany round trip
+        await session.exec(
+            update(Startup),
+            params=[
+                {"id": startup_id, column: vector}
+                for (startup_id, _), vector in zip(rows, vectors)
+            ],
+        )
+        await session.commit()
+
+
+async def embed_missing(batch_size: int, concurrency: int) -> int:
+    """Fill NULL embeddings whose source text is set; returns rows embedded."""
+    embedded = 0
+    for source, column in EMBEDDED_FIELDS.items():
+        db_column, db_source = getattr(Startup, column), getattr(Startup, source)
+        last_id, pending = 0, set()
+        while True:
+            async with async_session() as session:
+                rows = (
+                    await session.exec(
+                        select(Startup.id, db_source)
+                        .where(db_column.is_(None), db_source.is_not(None))
+                        .where(db_source != "", Startup.id > last_id)
+                        .order_by(Startup.id)
+                        .limit(batch_size)
+                    )
+                ).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            embedded += len(rows)
+            pending.add(asyncio.create_task(embed_rows(column, rows)))
+            if len(pending) >= concurrency:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    task.result()  # Surface failures
+            print(f"{column}: {embedded} embeddings requested")
+        for task in asyncio.as_completed(pending):
+            await task
+    await engine.dispose()
+    return embedded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", help="JSON array or NDJSON file of startups")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--no-embed", action="store_true")
+    parser.add_argument("--embed-batch-size", type=int, default=512)
+    parser.add_argument("--embed-concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    totals = load(args.path, args.batch_size)
+    if not args.no_embed:
+        totals["embedded"] = asyncio.run(
+            embed_missing(args.embed_batch_size, args.embed_concurrency)
+        )
+    print(f"✅ Import complete: {totals}")
+
+
+if __name__ == "__main__":
+    main()
@@ -25,6 +25,8 @@ CREATE TYPE num_employees AS ENUM('1-10', '11-50', '51-100', '101-1000', '>1000'
 
 CREATE TYPE trl AS ENUM('TRL 1-4', 'TRL 5-7', 'TRL 8-9');
 
+CREATE TYPE job_status AS ENUM('queued', 'running', 'succeeded', 'failed');
+
 -- Create startups table
 CREATE TABLE
     startups (
@@ -52,9 +54,29 @@ CREATE TABLE
         trl trl,
         trl_explanation TEXT,
         competitors JSONB,
-        use_cases JSONB
+        use_cases JSONB,
+        -- Weighted full-text document for GET /startups/search
+        search_vector TSVECTOR GENERATED ALWAYS AS (
+            setweight(to_tsvector('english'::regconfig, coalesce(company_name, '')), 'A') ||
+            setweight(to_tsvector('english'::regconfig, coalesce(tech_offering, '')), 'B') ||
+            setweight(to_tsvector('english'::regconfig, coalesce(uvp, '')), 'B') ||
+            setweight(to_tsvector('english'::regconfig, coalesce(use_cases::text, '')), 'C') ||
+            setweight(to_tsvector('english'::regconfig, coalesce(trl_explanation, '')), 'D')
+        ) STORED
     );
 
+CREATE INDEX ix_startups_search_vector ON startups USING gin (search_vector);
+
+-- Website host as matched by POST /lookup/check_urls (WEBSITE_HOST_SQL)
+CREATE INDEX ix_startups_website_host ON startups (regexp_replace(lower(company_website), '^([a-z][a-z0-9+.-]*://)?(www\.)?([^/:?#]+).*$', '\3'));
+
+-- Keyset pagination order for GET /startups/
+CREATE INDEX ix_startups_company_name_id ON startups (company_name, id);
+
+-- Approximate nearest neighbour search on cosine distance (<=>), pgvector >= 0.5
+CREATE INDEX ix_startups_tech_embedding_hnsw ON startups USING hnsw (tech_embedding vector_cosine_ops);
+CREATE INDEX ix_startups_uvp_embedding_hnsw ON startups USING hnsw (uvp_embedding vector_cosine_ops);
+
 -- Workstreams table
 CREATE TABLE
     workstreams (
@@ -75,4 +97,44 @@ CREATE TABLE
         risks TEXT,
         collaboration_potential TEXT,
         PRIMARY KEY (workstream_id, startup_id)
-    );
\ No newline at end of file
+    );
+
+-- The primary key leads with workstream_id; lookups by startup need their own
+CREATE INDEX ix_workstream_startup_evaluations_startup_id ON workstream_startup_evaluations (startup_id);
+
+-- Embedding cache keyed on sha256(model, text)
+CREATE TABLE
+    embedding_cache (
+        content_hash TEXT PRIMARY KEY,
+        model TEXT NOT NULL,
+        embedding VECTOR (1536) NOT NULL
+    );
+
+-- LLM response cache keyed on sha256 of the full request (api/response_cache.py)
+CREATE TABLE
+    llm_response_cache (
+        cache_key TEXT PRIMARY KEY,
+        model TEXT NOT NULL,
+        output_text TEXT NOT NULL,
+        created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+        expires_at TIMESTAMPTZ NOT NULL
+    );
+
+CREATE INDEX ix_llm_response_cache_created_at ON llm_response_cache (created_at);
+
+-- Queued LLM startup lookups (see api/jobs.py)
+CREATE TABLE
+    lookup_jobs (
+        id INT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+        startup_url TEXT NOT NULL,
+        status job_status NOT NULL DEFAULT 'queued',
+        progress TEXT,
+        attempts INT NOT NULL DEFAULT 0,
+        error TEXT,
+        startup_id INT REFERENCES startups (id) ON DELETE SET NULL,
+        locked_until TIMESTAMPTZ,
+        created_at TIMESTAMPTZ DEFAULT now(),
+        updated_at TIMESTAMPTZ DEFAULT now()
+    );
+
+CREATE INDEX ix_lookup_jobs_pending ON lookup_jobs (id) WHERE status IN ('queued', 'running');
@@ -0,0 +1,71 @@
+-- Bring a database created from an earlier init.sql up to date with it.
+-- Every statement is idempotent, so the script can be re-run at any time.
+-- On large tables, adding search_vector rewrites startups and the HNSW
+-- indexes take a while to build; run it before starting the new API.
+
+CREATE EXTENSION IF NOT EXISTS vector;
+
+DO $$ BEGIN
+    CREATE TYPE job_status AS ENUM('queued', 'running', 'succeeded', 'failed');
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+
+-- Weighted full-text document for GET /startups/search
+ALTER TABLE startups
+ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('english'::regconfig, coalesce(company_name, '')), 'A') ||
+    setweight(to_tsvector('english'::regconfig, coalesce(tech_offering, '')), 'B') ||
+    setweight(to_tsvector('english'::regconfig, coalesce(uvp, '')), 'B') ||
+    setweight(to_tsvector('english'::regconfig, coalesce(use_cases::text, '')), 'C') ||
+    setweight(to_tsvector('english'::regconfig, coalesce(trl_explanation, '')), 'D')
+) STORED;
+
+CREATE INDEX IF NOT EXISTS ix_startups_search_vector ON startups USING gin (search_vector);
+
+-- Website host as matched by POST /lookup/check_urls (WEBSITE_HOST_SQL)
+CREATE INDEX IF NOT EXISTS ix_startups_website_host ON startups (regexp_replace(lower(company_website), '^([a-z][a-z0-9+.-]*://)?(www\.)?([^/:?#]+).*$', '\3'));
+
+-- Keyset pagination order for GET /startups/
+CREATE INDEX IF NOT EXISTS ix_startups_company_name_id ON startups (company_name, id);
+
+-- Approximate nearest neighbour search on cosine distance (<=>), pgvector >= 0.5
+CREATE INDEX IF NOT EXISTS ix_startups_tech_embedding_hnsw ON startups USING hnsw (tech_embedding vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS ix_startups_uvp_embedding_hnsw ON startups USING hnsw (uvp_embedding vector_cosine_ops);
+
+-- The primary key leads with workstream_id; lookups by startup need their own
+CREATE INDEX IF NOT EXISTS ix_workstream_startup_evaluations_startup_id ON workstream_startup_evaluations (startup_id);
+
+-- Tables added since; the API also creates them at startup (init_db)
+CREATE TABLE IF NOT EXISTS
+    embedding_cache (
+        content_hash TEXT PRIMARY KEY,
+        model TEXT NOT NULL,
+        embedding VECTOR (1536) NOT NULL
+    );
+
+CREATE TABLE IF NOT EXISTS
+    llm_response_cache (
+        cache_key TEXT PRIMARY KEY,
+        model TEXT NOT NULL,
+        output_text TEXT NOT NULL,
+        created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+        expires_at TIMESTAMPTZ NOT NULL
+    );
+
+CREATE INDEX IF NOT EXISTS ix_llm_response_cache_created_at ON llm_response_cache (created_at);
+
+CREATE TABLE IF NOT EXISTS
+    lookup_jobs (
+        id INT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+        startup_url TEXT NOT NULL,
+        status job_status NOT NULL DEFAULT 'queued',
+        progress TEXT,
+        attempts INT NOT NULL DEFAULT 0,
+        error TEXT,
+        startup_id INT REFERENCES startups (id) ON DELETE SET NULL,
+        locked_until TIMESTAMPTZ,
+        created_at TIMESTAMPTZ DEFAULT now(),
+        updated_at TIMESTAMPTZ DEFAULT now()
+    );
+
+CREATE INDEX IF NOT EXISTS ix_lookup_jobs_pending ON lookup_jobs (id) WHERE status IN ('queued', 'running');
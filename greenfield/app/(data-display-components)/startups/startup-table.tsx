@@ -9,6 +9,8 @@ interface StartupTableProps<T extends StartupReadType | StartupType> {
     onClickStartup?: (startup: T | null) => void;
     selectedIds?: number[];
     setSelectedIds?: React.Dispatch<React.SetStateAction<number[]>>;
+    onLoadMore?: () => void; // Set while more pages are available
+    isLoadingMore?: boolean;
 }
 
 export default function StartupTable<T extends StartupReadType | StartupType>({
@@ -16,6 +18,8 @@ export default function StartupTable<T extends StartupReadType | StartupType>({
     onClickStartup,
     selectedIds,
     setSelectedIds,
+    onLoadMore,
+    isLoadingMore = false,
 }: StartupTableProps<T>) {
     const toggleRow = (id: number) => {
         setSelectedIds?.((prev) =>
@@ -109,6 +113,15 @@ export default function StartupTable<T extends StartupReadType | StartupType>({
                         No entry
                     </div>
                 )}
+                {onLoadMore && (
+                    <button
+                        onClick={onLoadMore}
+                        disabled={isLoadingMore}
+                        className="w-full px-4 py-2 text-center hover:bg-white/20 transition cursor-pointer disabled:cursor-default disabled:opacity-60"
+                    >
+                        {isLoadingMore ? "Loading..." : "Load more"}
+                    </button>
+                )}
             </div>
         </div>
     );
@@ -1,3 +1,5 @@
+import { useEffect, useState } from "react";
+
 import {
     EvaluationReadType,
     EvaluationUpdateType,
@@ -15,6 +17,85 @@ export const textOrUnknown = (text: string | undefined | null) =>
 export const textOrToBeFilled = (text: string | undefined | null) =>
     text ? text : <p className="text-gray-700">To be filled.</p>;
 
+// GET /startups/ is paginated: load one page at a time, following X-Next-Cursor
+const STARTUPS_PAGE_SIZE = 100;
+const STARTUPS_SEARCH_DELAY_MS = 300;
+
+interface StartupsPage {
+    startups: StartupReadType[];
+    nextCursor: string | null;
+    total: number | null; // Only sent with the first page
+}
+
+async function fetchStartupsPage(
+    search: string,
+    cursor: string | null
+): Promise<StartupsPage> {
+    const params = new URLSearchParams({ limit: String(STARTUPS_PAGE_SIZE) });
+    if (search) params.set("name", search);
+    if (cursor) params.set("cursor", cursor);
+    const res = await fetch(
+        `${process.env.NEXT_PUBLIC_API_URL}/startups/?${params}`
+    );
+    if (!res.ok) throw new Error(res.statusText);
+    const total = res.headers.get("X-Total-Count");
+    return {
+        startups: (await res.json()) as StartupReadType[],
+        nextCursor: res.headers.get("X-Next-Cursor"),
+        total: total === null ? null : Number(total),
+    };
+}
+
+// Startups whose company name contains `search`, filtered by the API. The
+// first page is (re)loaded when the search settles; loadMore appends the next.
+export function useStartupPages(search: string) {
+    const [startups, setStartups] = useState<StartupReadType[]>([]);
+    const [total, setTotal] = useState<number>(0);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [isFetching, setIsFetching] = useState<boolean>(false);
+
+    useEffect(() => {
+        let cancelled = false;
+        const timer = setTimeout(() => {
+            setIsFetching(true);
+            fetchStartupsPage(search, null)
+                .then((page) => {
+                    if (cancelled) return;
+                    setStartups(page.startups);
+                    setNextCursor(page.nextCursor);
+                    setTotal(page.total ?? page.startups.length);
+                })
+                .catch(() => {})
+                .finally(() => !cancelled && setIsFetching(false));
+        }, STARTUPS_SEARCH_DELAY_MS);
+        return () => {
+            cancelled = true;
+            clearTimeout(timer);
+        };
+    }, [search]);
+
+    const loadMore = () => {
+        if (!nextCursor || isFetching) return;
+        setIsFetching(true);
+        fetchStartupsPage(search, nextCursor)
+            .then((page) => {
+                setStartups((prev) => [...prev, ...page.startups]);
+                setNextCursor(page.nextCursor);
+            })
+            .catch(() => {})
+            .finally(() => setIsFetching(false));
+    };
+
+    return {
+        startups,
+        setStartups,
+        total,
+        setTotal,
+        isFetching,
+        loadMore: nextCursor ? loadMore : undefined,
+    };
+}
+
 interface deleteFromDBParams {
     type: "startups" | "workstreams" | ["evaluations", number];
     idsToDel: number[];
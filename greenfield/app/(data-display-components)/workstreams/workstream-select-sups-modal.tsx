@@ -1,8 +1,8 @@
 "use client";
 import PopupModal from "@/components/popup-modal";
-import { useEffect, useMemo, useState } from "react";
+import { useMemo, useState } from "react";
 import { StartupReadType, WorkstreamReadType } from "@/data_display/data-type";
-import { getUpdateWSFunction } from "../utils";
+import { getUpdateWSFunction, useStartupPages } from "../utils";
 import StartupTable from "../startups/startup-table";
 import Icon from "@/components/icon/icon";
 
@@ -19,33 +19,16 @@ export default function WorkstreamSelectSupsModal({
     setIsModalOpen,
     onSuccess = () => {},
 }: WorkstreamSelectSupsModalProps) {
-    const [startups, setStartups] = useState<StartupReadType[]>([]);
-    useEffect(() => {
-        fetch(`${process.env.NEXT_PUBLIC_API_URL}/startups/`)
-            .then((res) =>
-                res.json().then((data: StartupReadType[]) => {
-                    setStartups(data);
-                    setIsLoading(false);
-                })
-            )
-            .catch(() => setIsLoading(false));
-    }, []);
-
     const [error, setError] = useState<string>("");
     const [selectedIds, setSelectedIds] = useState<number[]>([]);
     const [search, setSearch] = useState<string>("");
+    const { startups, isFetching, loadMore } = useStartupPages(search);
     const workstreamCurrSupIDs = workstream.evaluations.map(
         (evaluation) => evaluation.startup.id
     );
     const filteredValues = useMemo(() => {
-        return startups.filter(
-            (sup) =>
-                sup.company_name
-                    ?.toLowerCase()
-                    .includes(search.toLowerCase()) &&
-                !workstreamCurrSupIDs.includes(sup.id)
-        );
-    }, [startups, search]);
+        return startups.filter((sup) => !workstreamCurrSupIDs.includes(sup.id));
+    }, [startups]);
 
     // Insert selected startups to selected workstream
     const insertStartupsToWS = () => {
@@ -91,6 +74,8 @@ export default function WorkstreamSelectSupsModal({
                     startups={filteredValues}
                     selectedIds={selectedIds}
                     setSelectedIds={setSelectedIds}
+                    onLoadMore={loadMore}
+                    isLoadingMore={isFetching}
                     onClickStartup={(sup: StartupReadType | null) => {
                         if (!sup) return;
                         const updatedSelectedIds = [...selectedIds];
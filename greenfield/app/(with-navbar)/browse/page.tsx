@@ -1,6 +1,6 @@
 "use client";
 
-import { useEffect, useMemo, useState } from "react";
+import { useEffect, useState } from "react";
 import { useRouter } from "next/navigation";
 
 import ConfirmModal from "@/components/confirm-modal";
@@ -12,7 +12,7 @@ import {
     WorkstreamReadType,
     WorkstreamType,
 } from "@/data_display/data-type";
-import { deleteFromDB } from "@/data_display/utils";
+import { deleteFromDB, useStartupPages } from "@/data_display/utils";
 import StartupEditForm from "@/startups/startup-edit-form";
 import StartupTable from "@/startups/startup-table";
 import StartupView from "@/startups/startup-view";
@@ -24,17 +24,9 @@ import WorkstreamSelectModal from "@/app/(data-display-components)/workstreams/w
 
 export default function BrowseStartups() {
     const [isLoading, setIsLoading] = useState<boolean>(false);
-    const [startups, setStartups] = useState<StartupReadType[]>([]);
-    useEffect(() => {
-        fetch(`${process.env.NEXT_PUBLIC_API_URL}/startups/`)
-            .then((res) =>
-                res.json().then((data: StartupReadType[]) => {
-                    setStartups(data);
-                    setIsLoading(false);
-                })
-            )
-            .catch(() => setIsLoading(false));
-    }, []);
+    const [search, setSearch] = useState<string>("");
+    const { startups, setStartups, total, setTotal, isFetching, loadMore } =
+        useStartupPages(search);
 
     // Sidebar controls
     const [inFullScreen, setInFullScreen] = useState<boolean>(false);
@@ -91,12 +83,6 @@ export default function BrowseStartups() {
 
     // Table controls
     const [selectedIds, setSelectedIds] = useState<number[]>([]);
-    const [search, setSearch] = useState<string>("");
-    const filteredValues = useMemo(() => {
-        return startups.filter((startup) =>
-            startup.company_name?.toLowerCase().includes(search.toLowerCase())
-        );
-    }, [startups, search]);
 
     // Delete Modal
     const [isDelModalOpen, setIsDelModalOpen] = useState<boolean>(false);
@@ -117,6 +103,7 @@ export default function BrowseStartups() {
                             !startupIDsToDel.includes(startup.id as number)
                     )
                 );
+                setTotal(total - startupIDsToDel.length);
             },
         });
     };
@@ -223,13 +210,18 @@ export default function BrowseStartups() {
                         deleteText={`Delete (${selectedIds.length})`}
                         disabled={selectedIds.length == 0 || !!selectedStartup}
                     />
+                    <span className="ml-auto text-sm text-stone-300">
+                        Showing {startups.length} of {total}
+                    </span>
                 </div>
                 {/* Table */}
                 <StartupTable
-                    startups={filteredValues}
+                    startups={startups}
                     onClickStartup={setSelectedStartup}
                     selectedIds={selectedIds}
                     setSelectedIds={setSelectedIds}
+                    onLoadMore={loadMore}
+                    isLoadingMore={isFetching}
                 />
             </div>
             {selectedStartup && (